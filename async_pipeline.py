@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Async Pipeline for Resume Optimizer
+Generates resumes from an event loop: CPU stages run in an executor and
+files are written by a small thread pool, so the loop never blocks
+"""
+
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from batch_runner import init_worker, build_in_worker
+
+DEFAULT_MAX_IN_FLIGHT = 8
+DEFAULT_WRITE_WORKERS = 2
+
+
+class GeneratedResume:
+    """Outcome of one job description: the saved file, or the error raised"""
+    __slots__ = ('title', 'filename', 'timings', 'error')
+
+    def __init__(self, title, filename=None, timings=None, error=None):
+        self.title = title
+        self.filename = filename
+        self.timings = timings or {}
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def _build_with(optimizer, title, description, output_dir):
+    return optimizer.build_resume(description, title, output_dir=output_dir)
+
+
+async def _iter_items(job_descriptions):
+    """Accept both plain and async iterables of (title, description)"""
+    if hasattr(job_descriptions, '__aiter__'):
+        async for item in job_descriptions:
+            yield item
+    else:
+        for item in job_descriptions:
+            yield item
+
+
+async def iter_generated(job_descriptions, output_dir='.', optimizer=None, workers=1,
+                         optimizer_options=None, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                         write_workers=DEFAULT_WRITE_WORKERS):
+    """Yield a GeneratedResume per (title, description), in completion order
+
+    job_descriptions may be an async iterable, e.g. a scraper feeding
+    postings; at most max_in_flight of them are taken before earlier ones
+    finish. With workers=1 the CPU stages run on one thread using optimizer
+    (a ResumeOptimizer, built from optimizer_options if None); with more,
+    each worker process loads its own. Writes wait for a free slot in the
+    writer pool, which holds back the CPU stages when the disk is slow."""
+    loop = asyncio.get_running_loop()
+    os.makedirs(output_dir, exist_ok=True)
+
+    if workers > 1:
+        cpu_executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                           initargs=(optimizer_options or {},))
+        build = build_in_worker
+    else:
+        if optimizer is None:
+            from resume_optimizer import ResumeOptimizer
+            optimizer = ResumeOptimizer(**(optimizer_options or {}))
+        # One thread: a ResumeOptimizer caches state and is not thread-safe
+        cpu_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='resume-cpu')
+        build = lambda *args: _build_with(optimizer, *args)
+    write_executor = ThreadPoolExecutor(max_workers=write_workers, thread_name_prefix='resume-write')
+
+    # The loop only keeps weak references to tasks, so running ones are held here
+    tasks = set()
+    in_flight = asyncio.Semaphore(max_in_flight)
+    write_slots = asyncio.Semaphore(write_workers)
+    finished = asyncio.Queue()
+
+    async def generate(title, description):
+        try:
+            resume = await loop.run_in_executor(cpu_executor, build, title, description, output_dir)
+            async with write_slots:
+                await loop.run_in_executor(write_executor, resume.save)
+            result = GeneratedResume(title, resume.filename, resume.timings)
+        except Exception as e:
+            result = GeneratedResume(title, error=e)
+        finally:
+            in_flight.release()
+        await finished.put(result)
+
+    async def feed():
+        count = 0
+        async for title, description in _iter_items(job_descriptions):
+            await in_flight.acquire()
+            task = loop.create_task(generate(title, description))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            count += 1
+        return count
+
+    feeder = loop.create_task(feed())
+    yielded = 0
+    try:
+        while not (feeder.done() and yielded == feeder.result()):
+            if feeder.done():
+                result = await finished.get()
+            else:
+                # Wake up for the next result, or when the input runs out
+                getter = loop.create_task(finished.get())
+                done, _ = await asyncio.wait({getter, feeder}, return_when=asyncio.FIRST_COMPLETED)
+                if getter not in done:
+                    getter.cancel()
+                    continue
+                result = getter.result()
+            yielded += 1
+            yield result
+    finally:
+        # On an error or an early exit, stop what is still running and wait
+        # for it to unwind before the executors shut down
+        feeder.cancel()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(feeder, *tasks, return_exceptions=True)
+        cpu_executor.shutdown(wait=False)
+        write_executor.shutdown(wait=True)
+
+
+async def generate_many(job_descriptions, output_dir='.', optimizer=None, workers=1,
+                        optimizer_options=None, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                        write_workers=DEFAULT_WRITE_WORKERS):
+    """Generate resumes for (title, description) pairs; results in completion order"""
+    return [result async for result in iter_generated(
+        job_descriptions, output_dir, optimizer, workers, optimizer_options,
+        max_in_flight, write_workers)]
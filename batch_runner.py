@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Batch Runner for Resume Optimizer
+Generates resumes for a folder of .txt job descriptions or a JSONL file of
+{title, description} records across a pool of worker processes
+"""
+
+import os
+import json
+import math
+import time
+import logging
+from concurrent.futures import FIRST_COMPLETED, wait
+
+DEFAULT_BATCH_WORKERS = os.cpu_count() or 1
+
+# Submitted but unfinished job descriptions per worker
+PENDING_PER_WORKER = 4
+
+
+def iter_job_descriptions(path, on_error=None):
+    """Yield (title, description) pairs from a folder of .txt files or a JSONL file
+
+    JSONL lines that are not a {title, description} object are passed to
+    on_error(line_number, error) and skipped; without on_error they raise."""
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if not name.endswith('.txt'):
+                continue
+            with open(os.path.join(path, name), 'r', encoding='utf-8') as f:
+                description = f.read().strip()
+            if description:
+                yield os.path.splitext(name)[0].replace('_', ' '), description
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+                description = (record.get('description') or '').strip()
+                title = (record.get('title') or '').strip()
+            except (ValueError, AttributeError) as e:
+                if on_error is None:
+                    raise
+                on_error(line_number, e)
+                continue
+            if description:
+                yield title, description
+
+
+def unique_titles(job_descriptions):
+    """Number repeated or missing titles so every resume gets its own file"""
+    seen = {}
+    for index, (title, description) in enumerate(job_descriptions, 1):
+        title = title or f"Resume {index}"
+        key = title.lower()
+        seen[key] = seen.get(key, 0) + 1
+        if seen[key] > 1:
+            title = f"{title} {seen[key]}"
+        yield title, description
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+_optimizer = None
+
+
+def init_worker(optimizer_options):
+    """Load src/ once per worker process"""
+    global _optimizer
+    # Imported here: resume_optimizer itself imports this module for its CLI
+    from resume_optimizer import ResumeOptimizer
+    # Workers stay quiet; the parent reports progress and the summary
+    logging.getLogger('resume_optimizer').setLevel(logging.ERROR)
+    _optimizer = ResumeOptimizer(**optimizer_options)
+
+
+def build_in_worker(title, description, output_dir):
+    """Build one resume without saving it; returns its ResumeResult"""
+    return _optimizer.build_resume(description, title, output_dir=output_dir)
+
+
+def _generate(title, description, output_dir):
+    start = time.perf_counter()
+    result = _optimizer.build_resume(description, title, output_dir=output_dir, save=True)
+    return result.filename, result.timings, time.perf_counter() - start, result.cached
+
+
+def run_batch(path, output_dir='.', workers=DEFAULT_BATCH_WORKERS, optimizer_options=None):
+    """Generate a resume per job description in path and print a throughput summary
+
+    Returns the number of resumes that failed."""
+    # Imported here: multiprocessing is slow to import and only batches need it
+    from concurrent.futures import ProcessPoolExecutor
+
+    os.makedirs(output_dir, exist_ok=True)
+    workers = max(1, workers)
+    stage_times = {}
+    totals = []
+    failures = 0
+    cache_hits = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(optimizer_options or {},)) as executor:
+        pending = {}
+
+        def collect(done):
+            nonlocal failures, cache_hits
+            for future in done:
+                title = pending.pop(future)
+                try:
+                    filename, timings, total, cached = future.result()
+                except Exception as e:
+                    failures += 1
+                    print(f"❌ {title}: {e}")
+                    continue
+                totals.append(total)
+                cache_hits += cached
+                for stage, seconds in timings.items():
+                    stage_times.setdefault(stage, []).append(seconds)
+                print(f"✅ [{len(totals)}] {filename}")
+
+        def skip(line_number, error):
+            nonlocal failures
+            failures += 1
+            print(f"❌ {path}:{line_number}: not a {{title, description}} record ({error})")
+
+        # Stream the input, keeping a bounded number of job descriptions in flight
+        for title, description in unique_titles(iter_job_descriptions(path, skip)):
+            if len(pending) >= workers * PENDING_PER_WORKER:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending[executor.submit(_generate, title, description, output_dir)] = title
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            collect(done)
+
+    elapsed = time.perf_counter() - start
+    print("\n" + "=" * 50)
+    if not totals:
+        print(f"❌ No resumes generated from {path}")
+        return failures
+    print(f"📦 {len(totals)} resumes in {elapsed:.2f}s "
+          f"({len(totals) / elapsed:.1f} resumes/sec, {workers} workers)")
+    if failures:
+        print(f"⚠️  {failures} job descriptions failed")
+    if (optimizer_options or {}).get('output_cache') is not None:
+        print(f"🗄️  Output cache: {cache_hits} hits, {len(totals) - cache_hits} misses "
+              f"({cache_hits / len(totals):.0%} hit rate)")
+    print(f"{'stage':<12}{'p50':>10}{'p99':>10}")
+    for stage, seconds in list(stage_times.items()) + [('total', totals)]:
+        print(f"{stage:<12}{percentile(seconds, 50) * 1000:>8.1f}ms{percentile(seconds, 99) * 1000:>8.1f}ms")
+    return failures
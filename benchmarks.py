@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for Resume Optimizer
+Run `python benchmarks.py --help` to list the available benchmarks
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+import argparse
+import subprocess
+
+from keyword_engine import BASE_DIR, get_default_matcher, build_keyword_matrix
+from job_classifier import get_default_job_index
+from job_model import JobTypeModel, load_labelled_corpus
+from rewrite_engine import RewriteEngine, rewrite_rules, rewrite_sequential
+from resume_model import SectionModel
+from page_estimator import block_height, layout_height, TEXT_HEIGHT_PT
+from resume_template import ResumeTemplate, write_chunks
+from bullet_packer import PackGroup, pack_bullets
+
+# Modules the CLI must not import before it needs them
+DEFERRED_MODULES = ('numpy', 'asyncio', 'multiprocessing', 'nltk', 'streamlit')
+
+
+def best_time(func, repeat=5):
+    """Return the fastest wall time of func() over repeat runs"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_job_model(args):
+    """Compare the trained naive Bayes model with the rule-based classifier"""
+    texts, labels = load_labelled_corpus(args.data_dir)
+    if len(texts) < 2:
+        print("❌ Need at least two labelled job descriptions")
+        return 1
+
+    # Deterministic holdout: every fifth document is kept for evaluation
+    train_ids = [i for i in range(len(texts)) if i % 5]
+    test_ids = [i for i in range(len(texts)) if not i % 5]
+
+    matcher = get_default_matcher()
+    train_matrix = build_keyword_matrix(matcher, [texts[i] for i in train_ids])
+    model = JobTypeModel.train(train_matrix, [labels[i] for i in train_ids])
+    rules = get_default_job_index()
+
+    test_texts = [texts[i] for i in test_ids]
+    test_labels = [labels[i] for i in test_ids]
+    test_keywords = [matcher.extract(text) for text in test_texts]
+    test_matrix = build_keyword_matrix(matcher, test_texts)
+
+    def accuracy(predicted):
+        return sum(p == t for p, t in zip(predicted, test_labels)) / len(test_labels)
+
+    results = [
+        ('rules (per JD)', lambda: [rules.detect(k) for k in test_keywords]),
+        ('rules (batch)', lambda: rules.classify_matrix(test_matrix)[0]),
+        ('model (per JD)', lambda: [model.detect(k) for k in test_keywords]),
+        ('model (batch)', lambda: model.detect_matrix(test_matrix)),
+    ]
+
+    print(f"📚 {len(train_ids)} training / {len(test_ids)} held-out job descriptions, "
+          f"{len(model.labels)} job types")
+    print(f"{'detector':<18}{'accuracy':>10}{'JDs/sec':>14}")
+    for name, func in results:
+        elapsed = best_time(func, args.repeat)
+        rate = len(test_ids) / elapsed if elapsed else float('inf')
+        print(f"{name:<18}{accuracy(func()):>10.1%}{rate:>14,.0f}")
+    return 0
+
+
+def bench_rewrite(args):
+    """Compare the fused rewrite engine with one re.sub pass per rule"""
+    with open(args.path, 'r', encoding='utf-8') as f:
+        text = f.read() * args.scale
+    print(f"📄 {os.path.basename(args.path)} x{args.scale}: {len(text):,} characters")
+
+    job_types = ['data_engineering', 'data_analyst', 'software_engineer', 'network_engineer', 'general']
+    print(f"{'job type':<20}{'sequential':>12}{'fused':>12}{'speedup':>10}")
+    for job_type in job_types:
+        rules = rewrite_rules(job_type)
+        engine = RewriteEngine(rules)
+        if engine.rewrite(text) != rewrite_sequential(text, rules):
+            print(f"❌ {job_type}: fused output differs from sequential output")
+            return 1
+
+        sequential = best_time(lambda: rewrite_sequential(text, rules), args.repeat)
+        fused = best_time(lambda: engine.rewrite(text), args.repeat)
+        print(f"{job_type:<20}{sequential * 1000:>10.2f}ms{fused * 1000:>10.2f}ms{sequential / fused:>9.1f}x")
+    print("✅ Fused output is byte-identical for every job type")
+    return 0
+
+
+def bench_page_estimate(args):
+    """Time one-page height estimates over random bullet selections"""
+    sections = {}
+    for name in ('heading', 'education', 'skills', 'experience', 'projects'):
+        with open(os.path.join(args.src, f'{name}.tex'), 'r', encoding='utf-8') as f:
+            sections[name] = f.read().strip()
+    experience = SectionModel(sections['experience'], 'resumeSubheading')
+    projects = SectionModel(sections['projects'], 'resumeProjectHeading')
+    blocks = [sections['heading'], sections['education'], sections['skills'],
+              experience.prefix, experience.suffix, projects.prefix, projects.suffix]
+
+    # Candidate layouts: every entry kept with a random non-empty subset of its bullets
+    rng = random.Random(0)
+    layouts = []
+    for _ in range(args.layouts):
+        entries = []
+        for section in (experience, projects):
+            for entry in section.entries:
+                ids = [i for i in range(len(entry.bullets)) if rng.random() < 0.7]
+                entries.append(entry.render(ids or range(len(entry.bullets))))
+        layouts.append(entries)
+
+    def estimate_all():
+        return [layout_height(blocks, entries) for entries in layouts]
+
+    block_height.cache_clear()
+    start = time.perf_counter()
+    heights = estimate_all()
+    cold = time.perf_counter() - start
+    warm = best_time(estimate_all, args.repeat)
+    fitting = sum(height <= TEXT_HEIGHT_PT for height in heights)
+    print(f"📄 {len(layouts)} candidate layouts, {fitting} estimated to fit on one page")
+    print(f"{'cold':<8}{cold / len(layouts) * 1e6:>10.1f}us per layout")
+    print(f"{'memoized':<8}{warm / len(layouts) * 1e6:>10.1f}us per layout")
+    return 0
+
+
+def bench_pack(args):
+    """Time the bullet packer on random experience and project entries"""
+    rng = random.Random(0)
+    groups = []
+    bullets = 0
+    while bullets < args.bullets:
+        count = min(rng.randint(2, 6), args.bullets - bullets)
+        # A handful of experience entries that must keep a bullet, then projects
+        required = len(groups) < 5
+        groups.append(PackGroup(2 if required else 1,
+                                [rng.choice((1, 1, 2, 2, 3)) for _ in range(count)],
+                                [rng.uniform(0.1, 5.0) for _ in range(count)], required))
+        bullets += count
+
+    selection = pack_bullets(groups, args.budget)
+    if selection is None:
+        print(f"❌ The required entries do not fit in {args.budget} lines")
+        return 1
+    kept = sum(len(ids) for ids in selection)
+    seconds = best_time(lambda: pack_bullets(groups, args.budget), args.repeat)
+    print(f"📦 {bullets} bullets in {len(groups)} entries, {kept} kept within {args.budget} lines")
+    print(f"{'pack':<8}{seconds * 1000:>10.2f}ms per solve")
+    return 0
+
+
+def bench_template(args):
+    """Compare per-document f-string assembly with the prebuilt template"""
+    sections = {}
+    for name in ('heading', 'education', 'skills', 'experience', 'projects'):
+        with open(os.path.join(args.src, f'{name}.tex'), 'r', encoding='utf-8') as f:
+            sections[name] = f.read().strip()
+    with open(os.path.join(BASE_DIR, 'preamble.tex'), 'r', encoding='utf-8') as f:
+        preamble = f.read()
+    template = ResumeTemplate(preamble, sections['heading'], sections['education'])
+    parts = ('2024-01-01 00:00', 'data_engineer', 42,
+             sections['skills'], sections['experience'], sections['projects'])
+
+    def concatenate(timestamp, job_type, keyword_count, skills, experience, projects):
+        # The original assembly: an f-string header, then chained +
+        header = f"""%-------------------------
+% ATS Optimized Resume
+% Generated: {timestamp}
+% Job Type: {job_type.replace('_', ' ').title()}
+% Keywords: {keyword_count} strategic terms
+%------------------------
+
+{preamble}
+\\begin{{document}}"""
+        return (header + "\n\n" + sections['heading'] + "\n\n" + sections['education'] + "\n\n" +
+                skills + "\n\n" + experience + "\n\n" + projects + "\n\n" + "\\end{document}")
+
+    if concatenate(*parts) != template.render(*parts):
+        print("❌ Template output differs from the concatenated document")
+        return 1
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'resume.tex')
+
+        def write_string(render):
+            for _ in range(args.documents):
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(render(*parts))
+
+        def stream():
+            for _ in range(args.documents):
+                write_chunks(path, template.chunks(*parts))
+
+        runs = [
+            ('concatenate', lambda: [concatenate(*parts) for _ in range(args.documents)]),
+            ('join', lambda: [template.render(*parts) for _ in range(args.documents)]),
+            ('concat+write', lambda: write_string(concatenate)),
+            ('join+write', lambda: write_string(template.render)),
+            ('writelines', stream),
+        ]
+        print(f"📄 {args.documents} documents of {len(template.render(*parts))} characters")
+        for name, func in runs:
+            seconds = best_time(func, args.repeat)
+            print(f"{name:<14}{seconds / args.documents * 1e6:>10.1f}us per document")
+    return 0
+
+
+def import_times(stderr):
+    """[(depth, module, cumulative microseconds)] parsed from -X importtime output"""
+    times = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line.split('|')
+        try:
+            cumulative = int(fields[1])
+        except (IndexError, ValueError):
+            continue  # the column header
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        times.append((depth, name.strip(), cumulative))
+    return times
+
+
+def profile_startup(arguments, repeat):
+    """(best wall seconds, import times of the fastest run) of python -X importtime arguments"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable, '-X', 'importtime'] + arguments, cwd=BASE_DIR,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        seconds = time.perf_counter() - start
+        if completed.returncode != 0:
+            raise RuntimeError(f"python {' '.join(arguments)} failed:\n{completed.stderr[-2000:]}")
+        if best is None or seconds < best[0]:
+            best = seconds, import_times(completed.stderr)
+    return best
+
+
+def bench_startup(args):
+    """Cold-start cost of importing the optimizer and of resume_optimizer.py --help"""
+    # One unmeasured run, so bytecode caches are written before timing
+    profile_startup(['-c', 'import resume_optimizer'], 1)
+    _, times = profile_startup(['-c', 'import resume_optimizer'], args.repeat)
+    import_ms = next(cumulative for depth, name, cumulative in times
+                     if depth == 0 and name == 'resume_optimizer') / 1000
+    heaviest = sorted(((cumulative, name) for depth, name, cumulative in times if depth == 1),
+                      reverse=True)[:args.top]
+    print(f"📦 import resume_optimizer: {import_ms:.1f}ms")
+    for cumulative, name in heaviest:
+        print(f"   {name:<22}{cumulative / 1000:>8.1f}ms")
+
+    wall, times = profile_startup(['resume_optimizer.py', '--help'], args.repeat)
+    imported = {name for _, name, _ in times}
+    deferred = [name for name in DEFERRED_MODULES if name in imported]
+    print(f"⏱️  resume_optimizer.py --help: {wall * 1000:.1f}ms wall, {len(imported)} modules imported")
+
+    failed = False
+    if deferred:
+        print(f"❌ --help imported {', '.join(deferred)}")
+        failed = True
+    if import_ms > args.budget_ms:
+        print(f"❌ Import took {import_ms:.1f}ms, over the {args.budget_ms:g}ms budget")
+        failed = True
+    if failed:
+        return 1
+    print(f"✅ Within the {args.budget_ms:g}ms import budget")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resume Optimizer benchmarks")
+    parser.add_argument('--repeat', type=int, default=5, help="timing repetitions (best run is reported)")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    job_model = subparsers.add_parser('job-model', help="naive Bayes model vs rule-based job type detection")
+    job_model.add_argument('data_dir', help="folder laid out as <job_type>/*.txt")
+    job_model.set_defaults(func=bench_job_model)
+
+    rewrite = subparsers.add_parser('rewrite', help="fused rewrite engine vs sequential re.sub passes")
+    rewrite.add_argument('path', nargs='?', default=os.path.join('src', 'experience.tex'),
+                         help="LaTeX section to rewrite (default: src/experience.tex)")
+    rewrite.add_argument('--scale', type=int, default=50, help="repeat the input this many times")
+    rewrite.set_defaults(func=bench_rewrite)
+
+    page = subparsers.add_parser('page-estimate', help="one-page height estimates per candidate layout")
+    page.add_argument('--src', default='src', help="folder with the resume sections (default: src)")
+    page.add_argument('--layouts', type=int, default=500, help="random candidate layouts to estimate")
+    page.set_defaults(func=bench_page_estimate)
+
+    pack = subparsers.add_parser('pack', help="grouped knapsack bullet packing against a line budget")
+    pack.add_argument('--bullets', type=int, default=200, help="random bullets to pack")
+    pack.add_argument('--budget', type=int, default=45, help="line budget (default: 45)")
+    pack.set_defaults(func=bench_pack)
+
+    template = subparsers.add_parser('template', help="f-string assembly vs prebuilt template chunks")
+    template.add_argument('--src', default='src', help="folder with the resume sections (default: src)")
+    template.add_argument('--documents', type=int, default=2000, help="documents to assemble per run")
+    template.set_defaults(func=bench_template)
+
+    startup = subparsers.add_parser('startup', help="-X importtime cold-start cost of the CLI, against a budget")
+    startup.add_argument('--budget-ms', type=float, default=150,
+                         help="fail when importing resume_optimizer takes longer (default: 150)")
+    startup.add_argument('--top', type=int, default=8, help="heaviest direct imports to list")
+    startup.set_defaults(func=bench_startup)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Bullet Packer for Resume Optimizer
+Chooses which experience and project bullets to keep so that keyword
+coverage is maximized within a fixed line or page-height budget
+"""
+
+from lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+
+# Heading cost of an entry when packing against a line budget
+EXPERIENCE_HEADING_LINES = 2
+PROJECT_HEADING_LINES = 1
+
+# Value of a bullet that matches no JD keyword, so spare lines still get used
+BASE_BULLET_VALUE = 0.1
+
+
+class PackGroup:
+    """An entry whose heading is paid once if any of its bullets is kept"""
+    __slots__ = ('heading_cost', 'costs', 'values', 'required')
+
+    def __init__(self, heading_cost, costs, values, required=False):
+        self.heading_cost = int(heading_cost)
+        self.costs = [int(cost) for cost in costs]
+        self.values = [float(value) for value in values]
+        self.required = required
+
+
+def pack_bullets(groups, budget):
+    """Pick bullets maximizing total value with total cost <= budget
+
+    Solves the grouped 0/1 knapsack exactly with a DP over the budget,
+    vectorized per bullet. Required groups keep at least one bullet;
+    optional groups are dropped entirely or pay their heading once.
+    Returns one sorted list of kept bullet indexes per group, or None if
+    the required groups alone do not fit."""
+    budget = int(budget)
+    size = budget + 1
+    best = np.zeros(size)
+    trace = []
+
+    for group in groups:
+        previous = best
+        opened = np.full(size, -np.inf)
+        choices = []
+        for cost, value in zip(group.costs, group.values):
+            # Either extend an already opened group or open it with this bullet
+            extend = np.full(size, -np.inf)
+            start = np.full(size, -np.inf)
+            if cost < size:
+                extend[cost:] = opened[:size - cost] + value
+            first_cost = group.heading_cost + cost
+            if first_cost < size:
+                start[first_cost:] = previous[:size - first_cost] + value
+
+            choice = np.zeros(size, dtype=np.int8)
+            updated = opened
+            better = extend > updated
+            choice[better] = 1
+            updated = np.where(better, extend, updated)
+            better = start > updated
+            choice[better] = 2
+            updated = np.where(better, start, updated)
+            opened = updated
+            choices.append(choice)
+
+        if group.required:
+            kept = np.ones(size, dtype=bool)
+            best = opened
+        else:
+            kept = opened > previous
+            best = np.where(kept, opened, previous)
+        trace.append((kept, choices))
+
+    if not groups:
+        return []
+    remaining = int(np.argmax(best))
+    if not np.isfinite(best[remaining]):
+        return None
+
+    # Walk the decisions backwards to recover the chosen bullets
+    selection = []
+    for group, (kept, choices) in zip(reversed(groups), reversed(trace)):
+        if not kept[remaining]:
+            selection.append([])
+            continue
+        chosen = []
+        for index in range(len(choices) - 1, -1, -1):
+            decision = choices[index][remaining]
+            if decision == 1:
+                chosen.append(index)
+                remaining -= group.costs[index]
+            elif decision == 2:
+                chosen.append(index)
+                remaining -= group.heading_cost + group.costs[index]
+                break
+        selection.append(sorted(chosen))
+    selection.reverse()
+    return selection
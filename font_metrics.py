@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Font Metrics for Resume Optimizer
+Precomputed Lato advance widths so the rendered line count of a bullet can
+be computed by table lookup, without running LaTeX
+"""
+
+import sys
+import array
+import struct
+
+from latex_scanner import parse, Text, Macro, Group
+
+# Advance widths of Lato Regular (v1.105) for code points 32-126, in
+# 1/1000 em. Regenerate with: python font_metrics.py path/to/Lato-Regular.ttf
+FIRST_CODE_POINT = 32
+LATO_REGULAR_WIDTHS = array.array('H', [
+    193, 343, 397, 580, 580, 786, 703, 230, 300, 300, 400, 580, 212, 347, 212, 373,  #  !"#$%&'()*+,-./
+    580, 580, 580, 580, 580, 580, 580, 580, 580, 580, 252, 252, 580, 580, 580, 398,  # 0123456789:;<=>?
+    822, 680, 647, 685, 753, 581, 566, 734, 756, 307, 444, 681, 514, 920, 756, 798,  # @ABCDEFGHIJKLMNO
+    611, 798, 644, 530, 590, 730, 680, 1019, 643, 629, 624, 300, 375, 300, 580, 394,  # PQRSTUVWXYZ[\]^_
+    307, 507, 559, 467, 559, 524, 337, 511, 556, 256, 254, 524, 256, 821, 556, 556,  # `abcdefghijklmno
+    552, 559, 403, 434, 373, 556, 512, 766, 504, 512, 462, 300, 300, 300, 580,  # pqrstuvwxyz{|}~
+])
+
+# Lato Bold sets about 4% wider than Regular
+BOLD_WIDTH_FACTOR = 1.04
+
+# Width used for characters outside the table (accented letters, dashes)
+DEFAULT_WIDTH = LATO_REGULAR_WIDTHS[ord('n') - FIRST_CODE_POINT]
+
+# Page geometry of the generated resume, in TeX points (72.27 per inch):
+# letterpaper with fullpage margins widened by 1in, bullets inside the
+# 0.15in sub-heading list and a second-level itemize (\leftmarginii = 2.2em)
+POINTS_PER_INCH = 72.27
+TEXT_WIDTH_PT = 7.5 * POINTS_PER_INCH
+BULLET_WIDTH_PT = TEXT_WIDTH_PT - 0.15 * POINTS_PER_INCH - 2.2 * 11
+BULLET_FONT_PT = 10.0  # \small in an 11pt article
+
+# Longest a bullet may wrap before it is flagged or trimmed
+MAX_BULLET_LINES = 2
+
+# Control symbols that typeset a visible character
+_SYMBOL_CHARS = {'%': '%', '&': '&', '$': '$', '#': '#', '_': '_', '{': '{', '}': '}', ' ': ' '}
+_BOLD_MACROS = frozenset({'textbf'})
+_SKIP_MACROS = frozenset({'href', 'url', 'vspace', 'hspace', 'label', 'ref', 'begin', 'end'})
+
+
+def char_width(ch):
+    """Advance width of a character in 1/1000 em"""
+    index = ord(ch) - FIRST_CODE_POINT
+    if 0 <= index < len(LATO_REGULAR_WIDTHS):
+        return LATO_REGULAR_WIDTHS[index]
+    return DEFAULT_WIDTH
+
+
+def string_width(text, size_pt):
+    """Width in points of plain text set in Regular at size_pt"""
+    return sum(char_width(ch) for ch in text) * size_pt / 1000.0
+
+
+def styled_text(source):
+    """Flatten LaTeX into a list of (text, bold) runs as they would be typeset"""
+    document = parse(source)
+    runs = []
+    stack = [(iter(document.children), False)]
+    while stack:
+        node = next(stack[-1][0], None)
+        bold = stack[-1][1]
+        if node is None:
+            stack.pop()
+        elif isinstance(node, Text):
+            text = source[node.start:node.end].replace('$', '').replace('~', ' ')
+            runs.append((text, bold))
+        elif isinstance(node, Macro):
+            if node.name in _SYMBOL_CHARS:
+                runs.append((_SYMBOL_CHARS[node.name], bold))
+            elif node.name == 'href' and len(node.args) > 1:
+                # Only the link label is typeset
+                stack.append((iter(node.args[1:]), bold))
+            elif node.name not in _SKIP_MACROS:
+                stack.append((iter(node.args), bold or node.name in _BOLD_MACROS))
+        elif isinstance(node, Group):
+            stack.append((iter(node.children), bold))
+    return runs
+
+
+def _words(runs, size_pt):
+    """Yield the width in points of every space-separated word"""
+    scale = size_pt / 1000.0
+    width = 0.0
+    in_word = False
+    for text, bold in runs:
+        factor = scale * BOLD_WIDTH_FACTOR if bold else scale
+        for ch in text:
+            if ch.isspace():
+                if in_word:
+                    yield width
+                    width = 0.0
+                    in_word = False
+            else:
+                width += char_width(ch) * factor
+                in_word = True
+    if in_word:
+        yield width
+
+
+def text_width(source, size_pt=BULLET_FONT_PT):
+    """Natural width in points of LaTeX source set on a single line"""
+    space = char_width(' ') * size_pt / 1000.0
+    widths = list(_words(styled_text(source), size_pt))
+    return sum(widths) + space * max(len(widths) - 1, 0)
+
+
+def line_count(source, line_width=BULLET_WIDTH_PT, size_pt=BULLET_FONT_PT):
+    """Number of lines LaTeX source wraps to, filling lines greedily"""
+    space = char_width(' ') * size_pt / 1000.0
+    lines = 0
+    used = None
+    for width in _words(styled_text(source), size_pt):
+        if used is None or used + space + width > line_width:
+            lines += 1
+            used = width
+        else:
+            used += space + width
+    return max(lines, 1)
+
+
+def trim_to_lines(source, max_lines=MAX_BULLET_LINES, line_width=BULLET_WIDTH_PT):
+    """Cut source at its last top-level clause boundary that fits max_lines
+
+    Only ',' and ';' in plain text outside any group are cut at, so macros
+    and braces stay balanced. Returns None when no clause boundary fits."""
+    document = parse(source)
+    cuts = []
+    for node in document.children:
+        if isinstance(node, Text):
+            for i in range(node.start, node.end):
+                if source[i] in ',;':
+                    cuts.append(i)
+    for cut in reversed(cuts):
+        trimmed = source[:cut].rstrip()
+        if line_count(trimmed, line_width) <= max_lines:
+            return trimmed + '.' if source.rstrip().endswith('.') else trimmed
+    return None
+
+
+def widths_from_ttf(path, first=FIRST_CODE_POINT, last=126):
+    """Read advance widths (1/1000 em) for a code point range from a TrueType font"""
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    tables = {}
+    for i in range(struct.unpack_from('>H', data, 4)[0]):
+        tag, _, offset, _ = struct.unpack_from('>4sIII', data, 12 + 16 * i)
+        tables[tag.decode('latin-1')] = offset
+    units_per_em = struct.unpack_from('>H', data, tables['head'] + 18)[0]
+    num_h_metrics = struct.unpack_from('>H', data, tables['hhea'] + 34)[0]
+
+    # Locate the Windows Unicode BMP (format 4) character map
+    cmap = tables['cmap']
+    subtable = None
+    for i in range(struct.unpack_from('>H', data, cmap + 2)[0]):
+        platform, encoding, offset = struct.unpack_from('>HHI', data, cmap + 4 + 8 * i)
+        if platform == 3 and encoding in (0, 1) and struct.unpack_from('>H', data, cmap + offset)[0] == 4:
+            subtable = cmap + offset
+    if subtable is None:
+        raise ValueError(f"{path} has no format 4 Unicode cmap")
+
+    seg_x2 = struct.unpack_from('>H', data, subtable + 6)[0]
+    segments = seg_x2 // 2
+    ends = struct.unpack_from(f'>{segments}H', data, subtable + 14)
+    starts = struct.unpack_from(f'>{segments}H', data, subtable + 16 + seg_x2)
+    deltas = struct.unpack_from(f'>{segments}h', data, subtable + 16 + 2 * seg_x2)
+    range_offsets_at = subtable + 16 + 3 * seg_x2
+    range_offsets = struct.unpack_from(f'>{segments}H', data, range_offsets_at)
+
+    def glyph_id(code_point):
+        for i in range(segments):
+            if starts[i] <= code_point <= ends[i]:
+                if range_offsets[i] == 0:
+                    return (code_point + deltas[i]) & 0xFFFF
+                address = range_offsets_at + 2 * i + range_offsets[i] + 2 * (code_point - starts[i])
+                glyph = struct.unpack_from('>H', data, address)[0]
+                return (glyph + deltas[i]) & 0xFFFF if glyph else 0
+        return 0
+
+    def advance(glyph):
+        glyph = min(glyph, num_h_metrics - 1)
+        return struct.unpack_from('>H', data, tables['hmtx'] + 4 * glyph)[0]
+
+    return [round(advance(glyph_id(cp)) * 1000 / units_per_em) for cp in range(first, last + 1)]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python font_metrics.py path/to/Lato-Regular.ttf")
+        sys.exit(1)
+    widths = widths_from_ttf(sys.argv[1])
+    for i in range(0, len(widths), 16):
+        print('    ' + ', '.join(str(width) for width in widths[i:i + 16]) + ',')
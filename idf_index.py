@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Corpus IDF Index for Resume Optimizer
+Keeps per-term document frequencies from a local job description corpus in
+a memory-mapped array that is updated in place as new postings are ingested
+"""
+
+import os
+import json
+
+from keyword_engine import CACHE_DIR, get_default_matcher, build_keyword_matrix
+from lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+
+DEFAULT_IDF_PATH = os.path.join(CACHE_DIR, 'idf.npy')
+
+
+class IdfIndex:
+    """Document frequencies stored as [n_documents, df(term_0), df(term_1), ...]"""
+
+    def __init__(self, path, terms):
+        self.path = path
+        self.terms = list(terms)
+        self.terms_path = os.path.splitext(path)[0] + '.terms.json'
+        self._counts = None
+        self._idf = None
+        self._open()
+
+    def _open(self):
+        """Memory-map the counts file, remapping it if the vocabulary changed"""
+        if not os.path.exists(self.path):
+            self._counts = np.zeros(len(self.terms) + 1, dtype=np.int64)
+            return
+
+        counts = np.load(self.path, mmap_mode='r')
+        try:
+            with open(self.terms_path, 'r', encoding='utf-8') as f:
+                stored_terms = json.load(f)
+        except FileNotFoundError:
+            stored_terms = None
+
+        if stored_terms == self.terms:
+            self._counts = counts
+            return
+
+        # Carry the stored frequencies over to the new term order
+        remapped = np.zeros(len(self.terms) + 1, dtype=np.int64)
+        remapped[0] = counts[0]
+        if stored_terms:
+            positions = {term: i for i, term in enumerate(stored_terms)}
+            for term_id, term in enumerate(self.terms):
+                if term in positions:
+                    remapped[term_id + 1] = counts[positions[term] + 1]
+        del counts
+        self._write(remapped)
+        self._counts = np.load(self.path, mmap_mode='r')
+
+    def _write(self, counts):
+        """Persist a full counts array and its vocabulary"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        np.save(self.path, counts)
+        with open(self.terms_path, 'w', encoding='utf-8') as f:
+            json.dump(self.terms, f)
+
+    @property
+    def n_documents(self):
+        return int(self._counts[0])
+
+    @property
+    def document_frequency(self):
+        return self._counts[1:]
+
+    def idf(self):
+        """Smoothed inverse document frequency of every term"""
+        if self._idf is None:
+            n_documents = self._counts[0]
+            self._idf = np.log((1.0 + n_documents) / (1.0 + self._counts[1:])) + 1.0
+        return self._idf
+
+    def add_documents(self, keyword_matrix):
+        """Fold a KeywordMatrix of new documents into the stored frequencies"""
+        if not os.path.exists(self.path):
+            self._write(np.asarray(self._counts))
+
+        counts = np.load(self.path, mmap_mode='r+')
+        counts[0] += keyword_matrix.shape[0]
+        counts[1:] += keyword_matrix.document_frequency()
+        counts.flush()
+        del counts
+
+        self._counts = np.load(self.path, mmap_mode='r')
+        self._idf = None
+        return keyword_matrix.shape[0]
+
+
+def iter_corpus(paths):
+    """Yield job description texts from .txt files and directories of them"""
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith('.txt'):
+                    with open(os.path.join(path, name), 'r', encoding='utf-8') as f:
+                        yield f.read()
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                yield f.read()
+
+
+def ingest_corpus(paths, idf_path=DEFAULT_IDF_PATH):
+    """Add every job description under paths to the IDF index"""
+    matcher = get_default_matcher()
+    index = IdfIndex(idf_path, matcher.terms)
+    index.add_documents(build_keyword_matrix(matcher, iter_corpus(paths)))
+    return index
+
+
+_default_index = None
+
+
+def get_default_idf_index():
+    """Open the default IDF index once per process"""
+    global _default_index
+    if _default_index is None:
+        _default_index = IdfIndex(DEFAULT_IDF_PATH, get_default_matcher().terms)
+    return _default_index
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Job Type Classifier for Resume Optimizer
+Scores job types through an inverted index from indicator keyword to
+weighted job types, one pass over a JD's keywords
+"""
+
+import json
+
+from keyword_engine import DEFAULT_TAXONOMY, get_default_matcher
+from lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+
+GENERAL_JOB_TYPE = 'general'
+
+
+def load_job_type_weights(taxonomy_path=DEFAULT_TAXONOMY):
+    """Read the {job_type: {term: weight}} indicators from the taxonomy file"""
+    with open(taxonomy_path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('job_types', {})
+
+
+class JobTypeIndex:
+    """Inverted index from indicator keyword to (job_type, weight) postings"""
+
+    def __init__(self, job_type_weights, min_score=1.0):
+        self.job_types = list(job_type_weights)
+        self.min_score = min_score
+        self.postings = {}
+        for job_index, (job_type, weights) in enumerate(job_type_weights.items()):
+            for term, weight in weights.items():
+                self.postings.setdefault(term.lower(), []).append((job_index, float(weight)))
+        self._weight_matrix = None
+
+    def score(self, keywords):
+        """Return the raw score of every job type for a keyword list"""
+        scores = [0.0] * len(self.job_types)
+        for keyword in set(keywords):
+            for job_index, weight in self.postings.get(keyword, ()):
+                scores[job_index] += weight
+        return scores
+
+    def classify(self, keywords):
+        """Return [(job_type, confidence), ...] ranked best first
+
+        Job types listed earlier in the taxonomy win ties. When nothing
+        reaches min_score the result is [('general', 1.0)]."""
+        return self._rank(self.score(keywords))
+
+    def detect(self, keywords):
+        """Return the single best job type for a keyword list"""
+        return self.classify(keywords)[0][0]
+
+    def _rank(self, scores):
+        total = sum(scores)
+        if total <= 0 or max(scores) < self.min_score:
+            return [(GENERAL_JOB_TYPE, 1.0)]
+        ranked = sorted(((score, -job_index) for job_index, score in enumerate(scores) if score > 0),
+                        reverse=True)
+        return [(self.job_types[-neg_index], score / total) for score, neg_index in ranked]
+
+    def weight_matrix(self, matcher):
+        """Dense (terms x job types) weight matrix aligned with matcher.terms"""
+        if self._weight_matrix is None:
+            weights = np.zeros((len(matcher.terms), len(self.job_types)))
+            for term, postings in self.postings.items():
+                term_id = matcher.term_ids.get(term)
+                if term_id is None:
+                    continue
+                for job_index, weight in postings:
+                    weights[term_id, job_index] += weight
+            self._weight_matrix = weights
+        return self._weight_matrix
+
+    def classify_matrix(self, keyword_matrix, matcher=None):
+        """Classify every row of a KeywordMatrix with one sparse dot product
+
+        Returns (labels, confidences) where confidences is a
+        (documents x job types) array of normalized scores."""
+        matcher = matcher or get_default_matcher()
+        scores = keyword_matrix.dot(self.weight_matrix(matcher), binary=True)
+
+        totals = scores.sum(axis=1, keepdims=True)
+        confidences = np.divide(scores, totals, out=np.zeros_like(scores), where=totals > 0)
+
+        # argmax returns the first maximum, matching the taxonomy-order tie break
+        best = scores.argmax(axis=1) if len(self.job_types) else np.zeros(len(scores), dtype=int)
+        labels = [self.job_types[job_index] if scores[doc, job_index] >= self.min_score and scores[doc, job_index] > 0
+                  else GENERAL_JOB_TYPE
+                  for doc, job_index in enumerate(best)]
+        return labels, confidences
+
+
+_default_index = None
+
+
+def get_default_job_index():
+    """Build the default job type index once per process"""
+    global _default_index
+    if _default_index is None:
+        _default_index = JobTypeIndex(load_job_type_weights())
+    return _default_index
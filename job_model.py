@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Trainable Job Type Model for Resume Optimizer
+Multinomial naive Bayes over taxonomy keywords, trained from a folder of
+labelled job descriptions and saved as flat NumPy arrays
+"""
+
+import os
+import json
+
+from keyword_engine import CACHE_DIR, get_default_matcher, build_keyword_matrix
+from lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+
+DEFAULT_MODEL_DIR = os.path.join(CACHE_DIR, 'job_model')
+MODEL_FORMAT_VERSION = 1
+
+
+def load_labelled_corpus(data_dir):
+    """Read data_dir/<job_type>/*.txt into parallel (texts, labels) lists"""
+    texts, labels = [], []
+    for label in sorted(os.listdir(data_dir)):
+        label_dir = os.path.join(data_dir, label)
+        if not os.path.isdir(label_dir):
+            continue
+        for name in sorted(os.listdir(label_dir)):
+            if name.endswith('.txt'):
+                with open(os.path.join(label_dir, name), 'r', encoding='utf-8') as f:
+                    texts.append(f.read())
+                labels.append(label)
+    return texts, labels
+
+
+class JobTypeModel:
+    """Naive Bayes job type detector over keyword presence features"""
+
+    def __init__(self, labels, terms, class_log_prior, feature_log_prob):
+        self.labels = list(labels)
+        self.terms = list(terms)
+        self.term_ids = {term: term_id for term_id, term in enumerate(self.terms)}
+        self.class_log_prior = class_log_prior
+        self.feature_log_prob = feature_log_prob
+
+    @classmethod
+    def train(cls, keyword_matrix, labels, alpha=1.0):
+        """Fit class priors and per-class term log probabilities"""
+        classes = sorted(set(labels))
+        class_ids = {label: i for i, label in enumerate(classes)}
+        y = np.array([class_ids[label] for label in labels], dtype=np.int64)
+
+        # Count term presence per class straight from the CSR arrays
+        term_counts = np.zeros((len(classes), keyword_matrix.shape[1]))
+        rows = keyword_matrix.row_indices()
+        np.add.at(term_counts, (y[rows], keyword_matrix.indices), 1.0)
+
+        smoothed = term_counts + alpha
+        feature_log_prob = np.log(smoothed) - np.log(smoothed.sum(axis=1, keepdims=True))
+        class_log_prior = np.log(np.bincount(y, minlength=len(classes)) / len(y))
+        return cls(classes, keyword_matrix.terms, class_log_prior, feature_log_prob)
+
+    def save(self, model_dir=DEFAULT_MODEL_DIR):
+        """Write the model as .npy arrays plus a small JSON header"""
+        os.makedirs(model_dir, exist_ok=True)
+        np.save(os.path.join(model_dir, 'class_log_prior.npy'), np.asarray(self.class_log_prior))
+        np.save(os.path.join(model_dir, 'feature_log_prob.npy'), np.asarray(self.feature_log_prob))
+        with open(os.path.join(model_dir, 'model.json'), 'w', encoding='utf-8') as f:
+            json.dump({'version': MODEL_FORMAT_VERSION, 'labels': self.labels, 'terms': self.terms}, f)
+
+    @classmethod
+    def load(cls, model_dir=DEFAULT_MODEL_DIR):
+        """Memory-map a saved model"""
+        with open(os.path.join(model_dir, 'model.json'), 'r', encoding='utf-8') as f:
+            header = json.load(f)
+        if header.get('version') != MODEL_FORMAT_VERSION:
+            raise ValueError(f"Unsupported job model version in {model_dir}, please retrain")
+        return cls(header['labels'], header['terms'],
+                   np.load(os.path.join(model_dir, 'class_log_prior.npy'), mmap_mode='r'),
+                   np.load(os.path.join(model_dir, 'feature_log_prob.npy'), mmap_mode='r'))
+
+    def classify(self, keywords):
+        """Return [(job_type, probability), ...] ranked best first"""
+        term_ids = sorted({self.term_ids[k] for k in keywords if k in self.term_ids})
+        log_scores = self.class_log_prior + self.feature_log_prob[:, term_ids].sum(axis=1)
+        probabilities = np.exp(log_scores - log_scores.max())
+        probabilities /= probabilities.sum()
+        order = np.argsort(-probabilities, kind='stable')
+        return [(self.labels[i], float(probabilities[i])) for i in order]
+
+    def detect(self, keywords):
+        """Return the most probable job type for a keyword list"""
+        return self.classify(keywords)[0][0]
+
+    def detect_matrix(self, keyword_matrix):
+        """Predict a job type for every row of a KeywordMatrix"""
+        weights = self._aligned_weights(keyword_matrix.terms)
+        log_scores = keyword_matrix.dot(weights, binary=True) + self.class_log_prior
+        return [self.labels[i] for i in log_scores.argmax(axis=1)]
+
+    def _aligned_weights(self, terms):
+        """Feature log probabilities as a (terms x classes) matrix in the given term order"""
+        if terms == self.terms:
+            return self.feature_log_prob.T
+        weights = np.zeros((len(terms), len(self.labels)))
+        for term_id, term in enumerate(terms):
+            model_id = self.term_ids.get(term)
+            if model_id is not None:
+                weights[term_id] = self.feature_log_prob[:, model_id]
+        return weights
+
+
+def train_job_model(data_dir, model_dir=DEFAULT_MODEL_DIR):
+    """Train on data_dir/<job_type>/*.txt and save the model to model_dir"""
+    texts, labels = load_labelled_corpus(data_dir)
+    if not texts:
+        raise ValueError(f"No labelled .txt job descriptions found under {data_dir}")
+    model = JobTypeModel.train(build_keyword_matrix(get_default_matcher(), texts), labels)
+    model.save(model_dir)
+    return model, len(texts)
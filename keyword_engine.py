@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Keyword Engine for Resume Optimizer
+Compiles the keyword taxonomy into a single Aho-Corasick automaton so each
+job description is scanned in one linear pass
+"""
+
+import os
+import json
+import array
+import pickle
+import hashlib
+from collections import Counter
+
+from lazy_imports import lazy_import
+
+# numpy is only needed once a keyword matrix is built
+np = lazy_import('numpy')
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TAXONOMY = os.path.join(BASE_DIR, 'keyword_taxonomy.json')
+CACHE_DIR = os.path.join(BASE_DIR, '.resume_cache')
+
+# Bump whenever the KeywordMatcher layout changes so stale caches are rebuilt
+MATCHER_FORMAT_VERSION = 1
+
+
+def _is_word_char(ch):
+    """Match the regex definition of a word character"""
+    return ch.isalnum() or ch == '_'
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over a categorized keyword vocabulary"""
+
+    def __init__(self, vocabulary):
+        # Canonical terms form the vocabulary index; aliases map onto them
+        self.terms = []
+        self.categories = []
+        self.term_ids = {}
+
+        # goto[state] maps a character to the next state, fail[state] is the
+        # longest proper suffix state and output[state] holds the
+        # (term_id, length) pairs that end at this state
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [()]
+
+        for category, terms in vocabulary.items():
+            if isinstance(terms, dict):
+                entries = terms.items()
+            else:
+                entries = ((term, ()) for term in terms)
+            for term, aliases in entries:
+                term_id = self.add_term(term, category)
+                for alias in aliases:
+                    self.add_pattern(alias, term_id)
+        self.build()
+
+    def add_term(self, term, category):
+        """Register a canonical term and its own spelling, returning its id"""
+        term = term.lower()
+        if term in self.term_ids:
+            return self.term_ids[term]
+
+        term_id = len(self.terms)
+        self.terms.append(term)
+        self.categories.append(category)
+        self.term_ids[term] = term_id
+        self.add_pattern(term, term_id)
+        return term_id
+
+    def add_pattern(self, pattern, term_id):
+        """Insert a surface form into the trie that reports term_id"""
+        state = 0
+        for ch in pattern.lower():
+            next_state = self.goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(())
+                self.goto[state][ch] = next_state
+            state = next_state
+
+        if all(existing != term_id for existing, _ in self.output[state]):
+            self.output[state] = self.output[state] + ((term_id, len(pattern)),)
+
+    def build(self):
+        """Compute failure links breadth-first and merge suffix outputs"""
+        queue = list(self.goto[0].values())
+        for state in queue:
+            self.fail[state] = 0
+
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(ch, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def __getstate__(self):
+        """Serialize the automaton as flat arrays instead of per-state dicts"""
+        edge_offsets = array.array('I', [0])
+        edge_chars = array.array('I')
+        edge_targets = array.array('I')
+        output_offsets = array.array('I', [0])
+        output_terms = array.array('I')
+        output_lengths = array.array('I')
+
+        for state in range(len(self.fail)):
+            for ch, target in self._edges(state).items():
+                edge_chars.append(ord(ch))
+                edge_targets.append(target)
+            edge_offsets.append(len(edge_chars))
+            for term_id, length in self._outputs(state):
+                output_terms.append(term_id)
+                output_lengths.append(length)
+            output_offsets.append(len(output_terms))
+
+        return {
+            'terms': self.terms,
+            'categories': self.categories,
+            'fail': array.array('I', self.fail).tobytes(),
+            'edge_offsets': edge_offsets.tobytes(),
+            'edge_chars': edge_chars.tobytes(),
+            'edge_targets': edge_targets.tobytes(),
+            'output_offsets': output_offsets.tobytes(),
+            'output_terms': output_terms.tobytes(),
+            'output_lengths': output_lengths.tobytes(),
+        }
+
+    def __setstate__(self, state):
+        """Restore the flat arrays; per-state dicts are rebuilt on first visit"""
+        self.terms = state['terms']
+        self.categories = state['categories']
+        self.term_ids = {term: term_id for term_id, term in enumerate(self.terms)}
+
+        for name in ('fail', 'edge_offsets', 'edge_chars', 'edge_targets',
+                     'output_offsets', 'output_terms', 'output_lengths'):
+            values = array.array('I')
+            values.frombytes(state[name])
+            setattr(self, '_' + name, values)
+
+        self.fail = self._fail
+        self.goto = [None] * len(self.fail)
+        self.output = [None] * len(self.fail)
+        self._edges(0)
+
+    def _edges(self, state):
+        """Return the transition dict of a state, loading it if needed"""
+        edges = self.goto[state]
+        if edges is None:
+            lo, hi = self._edge_offsets[state], self._edge_offsets[state + 1]
+            edges = dict(zip(map(chr, self._edge_chars[lo:hi]), self._edge_targets[lo:hi]))
+            self.goto[state] = edges
+        return edges
+
+    def _outputs(self, state):
+        """Return the (term_id, length) outputs of a state, loading them if needed"""
+        outputs = self.output[state]
+        if outputs is None:
+            lo, hi = self._output_offsets[state], self._output_offsets[state + 1]
+            outputs = tuple(zip(self._output_terms[lo:hi], self._output_lengths[lo:hi]))
+            self.output[state] = outputs
+        return outputs
+
+    def finditer(self, text):
+        """Yield (start, end, term_id) for every whole-word mention in text, in order
+
+        Where spellings of one term nest (react in react.js, etl and elt in
+        etl/elt), the mention is reported once, for its longest span."""
+        kept = []
+        spans = {}
+        for start, end, term_id in self._scan(text):
+            # Matches arrive by end position, so a longer spelling of the
+            # term comes after the shorter ones it contains
+            indexes = spans.get(term_id)
+            if indexes is None:
+                indexes = spans[term_id] = []
+            while indexes and start <= kept[indexes[-1]][0]:
+                kept[indexes.pop()] = None
+            if indexes and start < kept[indexes[-1]][1]:
+                continue
+            indexes.append(len(kept))
+            kept.append((start, end, term_id))
+        yield from sorted(match for match in kept if match is not None)
+
+    def _scan(self, text):
+        """Yield (start, end, term_id) for every whole-word match of every spelling"""
+        text = text.lower()
+        goto, fail, output = self.goto, self.fail, self.output
+        length = len(text)
+        state = 0
+
+        for i, ch in enumerate(text):
+            while True:
+                edges = goto[state]
+                if edges is None:
+                    edges = self._edges(state)
+                if not state or ch in edges:
+                    break
+                state = fail[state]
+            state = edges.get(ch, 0)
+
+            outputs = output[state]
+            if outputs is None:
+                outputs = self._outputs(state)
+            if not outputs:
+                continue
+
+            end = i + 1
+            at_boundary = end == length or not _is_word_char(text[end])
+            if not at_boundary:
+                continue
+            for term_id, term_length in outputs:
+                start = end - term_length
+                if start == 0 or not _is_word_char(text[start - 1]):
+                    yield start, end, term_id
+
+    def find_all(self, text):
+        """Return every match in text as a (term, category) pair"""
+        return [(self.terms[term_id], self.categories[term_id])
+                for _, _, term_id in self.finditer(text)]
+
+    def extract(self, text):
+        """Return the sorted unique terms found in text"""
+        return sorted({self.terms[term_id] for _, _, term_id in self.finditer(text)})
+
+
+class KeywordMatrix:
+    """Sparse document x term keyword counts in CSR layout"""
+
+    def __init__(self, data, indices, indptr, terms, categories):
+        self.data = data
+        self.indices = indices
+        self.indptr = indptr
+        self.terms = terms
+        self.categories = categories
+        self.vocabulary_index = {term: term_id for term_id, term in enumerate(terms)}
+        self.shape = (len(indptr) - 1, len(terms))
+
+    def __len__(self):
+        return self.shape[0]
+
+    def row(self, doc):
+        """Return the {term: count} mapping of one document"""
+        lo, hi = self.indptr[doc], self.indptr[doc + 1]
+        return {self.terms[term_id]: int(count)
+                for term_id, count in zip(self.indices[lo:hi], self.data[lo:hi])}
+
+    def row_indices(self):
+        """Return the document index of every stored count"""
+        return np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    def toarray(self):
+        """Return the dense counts as a 2-D array"""
+        dense = np.zeros(self.shape, dtype=self.data.dtype)
+        dense[self.row_indices(), self.indices] = self.data
+        return dense
+
+    def term_totals(self):
+        """Total occurrences of each term across all documents"""
+        return np.bincount(self.indices, weights=self.data, minlength=self.shape[1])
+
+    def document_frequency(self):
+        """Number of documents each term appears in"""
+        return np.bincount(self.indices, minlength=self.shape[1])
+
+    def dot(self, weights, binary=False):
+        """Multiply by a dense (terms x k) matrix, returning (documents x k)
+
+        With binary=True every stored count is treated as 1 (term presence)."""
+        weights = np.asarray(weights)
+        if binary:
+            contributions = weights[self.indices]
+        else:
+            contributions = self.data[:, None] * weights[self.indices]
+        result = np.zeros((self.shape[0], weights.shape[1]), dtype=contributions.dtype)
+        np.add.at(result, self.row_indices(), contributions)
+        return result
+
+
+def build_keyword_matrix(matcher, job_descriptions):
+    """Scan an iterable of job descriptions into a KeywordMatrix"""
+    data = array.array('i')
+    indices = array.array('i')
+    indptr = array.array('q', [0])
+
+    for job_description in job_descriptions:
+        counts = Counter(term_id for _, _, term_id in matcher.finditer(job_description))
+        for term_id in sorted(counts):
+            indices.append(term_id)
+            data.append(counts[term_id])
+        indptr.append(len(indices))
+
+    return KeywordMatrix(np.frombuffer(data, dtype=np.int32),
+                         np.frombuffer(indices, dtype=np.int32),
+                         np.frombuffer(indptr, dtype=np.int64),
+                         matcher.terms, matcher.categories)
+
+
+def load_taxonomy(taxonomy_path=DEFAULT_TAXONOMY):
+    """Read the taxonomy file, returning (categories, digest)"""
+    with open(taxonomy_path, 'rb') as f:
+        raw = f.read()
+    taxonomy = json.loads(raw.decode('utf-8'))
+    return taxonomy['categories'], hashlib.sha256(raw).hexdigest()
+
+
+def load_matcher(taxonomy_path=DEFAULT_TAXONOMY, cache_dir=CACHE_DIR):
+    """Load the compiled matcher from cache, rebuilding it if the taxonomy changed"""
+    with open(taxonomy_path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+
+    cache_name = os.path.splitext(os.path.basename(taxonomy_path))[0] + '.matcher.pickle'
+    cache_path = os.path.join(cache_dir, cache_name)
+    try:
+        with open(cache_path, 'rb') as f:
+            version, cached_digest, matcher = pickle.load(f)
+        if version == MATCHER_FORMAT_VERSION and cached_digest == digest:
+            return matcher
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        pass
+
+    categories, digest = load_taxonomy(taxonomy_path)
+    matcher = KeywordMatcher(categories)
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((MATCHER_FORMAT_VERSION, digest, matcher), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # A read-only checkout still works, it just recompiles every start
+        pass
+
+    return matcher
+
+
+_default_matcher = None
+
+
+def get_default_matcher():
+    """Load the default taxonomy matcher once per process"""
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = load_matcher()
+    return _default_matcher
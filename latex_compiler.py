@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+LaTeX Compiler for Resume Optimizer
+Compiles generated resumes with a bounded pool of local pdflatex/latexmk
+processes and reports the page count of each PDF
+"""
+
+import os
+import re
+import zlib
+import shutil
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from keyword_engine import CACHE_DIR
+from lazy_imports import lazy_import
+
+# Only needed once something is compiled
+subprocess = lazy_import('subprocess')
+tempfile = lazy_import('tempfile')
+
+DEFAULT_COMPILE_WORKERS = min(4, os.cpu_count() or 1)
+COMPILE_TIMEOUT = 120
+
+# Preamble format dump (mylatexformat): everything before DUMP_MARKER is
+# precompiled once and reused by every compile until the preamble changes
+DUMP_MARKER = r'\csname endofdump\endcsname'
+FORMAT_NAME = 'resume_preamble'
+DEFAULT_FORMAT_DIR = os.path.join(CACHE_DIR, 'latex_format')
+
+_LOG_PAGES = re.compile(rb'Output written on .*?\((\d+) pages?', re.DOTALL)
+_PDF_PAGE = re.compile(rb'/Type\s*/Page(?![a-zA-Z])')
+_PDF_STREAM = re.compile(rb'stream\r?\n(.*?)\r?\nendstream', re.DOTALL)
+
+
+def find_latex_engine():
+    """Return the command used to build a PDF, preferring latexmk, or None"""
+    if shutil.which('latexmk'):
+        return ['latexmk', '-pdf', '-interaction=nonstopmode', '-halt-on-error']
+    if shutil.which('pdflatex'):
+        return ['pdflatex', '-interaction=nonstopmode', '-halt-on-error']
+    return None
+
+
+def pdf_page_count(pdf):
+    """Count the page objects of a PDF, looking inside compressed object streams"""
+    count = len(_PDF_PAGE.findall(pdf))
+    for match in _PDF_STREAM.finditer(pdf):
+        try:
+            count += len(_PDF_PAGE.findall(zlib.decompress(match.group(1))))
+        except zlib.error:
+            continue
+    return count or None
+
+
+class CompileResult:
+    """Outcome of one compile: page count (None on failure), PDF bytes and log tail"""
+    __slots__ = ('pages', 'pdf', 'log')
+
+    def __init__(self, pages, pdf, log):
+        self.pages = pages
+        self.pdf = pdf
+        self.log = log
+
+    @property
+    def ok(self):
+        return self.pages is not None
+
+
+def compile_latex(source, engine, timeout=COMPILE_TIMEOUT, name='resume', env=None):
+    """Compile LaTeX source in a private temporary directory"""
+    with tempfile.TemporaryDirectory(prefix='resume-compile-') as workdir:
+        tex_path = os.path.join(workdir, f'{name}.tex')
+        with open(tex_path, 'w', encoding='utf-8') as f:
+            f.write(source)
+        try:
+            subprocess.run(engine + [f'{name}.tex'], cwd=workdir, env=env, stdin=subprocess.DEVNULL,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return CompileResult(None, None, f"timed out after {timeout}s")
+
+        log = b''
+        log_path = os.path.join(workdir, f'{name}.log')
+        if os.path.exists(log_path):
+            with open(log_path, 'rb') as f:
+                log = f.read()
+        pdf = None
+        pdf_path = os.path.join(workdir, f'{name}.pdf')
+        if os.path.exists(pdf_path):
+            with open(pdf_path, 'rb') as f:
+                pdf = f.read()
+        if pdf is None:
+            return CompileResult(None, None, log[-2000:].decode('utf-8', 'replace'))
+
+        # The log states the page count; fall back to the PDF itself
+        match = None
+        for match in _LOG_PAGES.finditer(log):
+            pass
+        pages = int(match.group(1)) if match else pdf_page_count(pdf)
+        return CompileResult(pages, pdf, log[-2000:].decode('utf-8', 'replace'))
+
+
+def build_format(preamble, format_dir=DEFAULT_FORMAT_DIR, timeout=COMPILE_TIMEOUT):
+    """Dump the static part of preamble into a pdflatex format
+
+    The dump is rebuilt only when the text before DUMP_MARKER (or the
+    pdflatex version) changes.
+    Returns the format directory, or None if the preamble has no marker or
+    the dump fails (compiles then load the full preamble as usual)."""
+    if DUMP_MARKER not in preamble or not shutil.which('pdflatex'):
+        return None
+    static = preamble.split(DUMP_MARKER, 1)[0]
+    # A TeX upgrade invalidates formats, so the engine version is part of the key
+    version = subprocess.run(['pdflatex', '--version'], stdout=subprocess.PIPE,
+                             stderr=subprocess.DEVNULL).stdout.split(b'\n', 1)[0]
+    digest = hashlib.sha256(version + b'\0' + static.encode('utf-8')).hexdigest()
+    format_path = os.path.join(format_dir, f'{FORMAT_NAME}.fmt')
+    stamp_path = os.path.join(format_dir, f'{FORMAT_NAME}.sha256')
+    try:
+        with open(stamp_path, 'r', encoding='utf-8') as f:
+            if f.read().strip() == digest and os.path.exists(format_path):
+                return format_dir
+    except OSError:
+        pass
+
+    with tempfile.TemporaryDirectory(prefix='resume-format-') as workdir:
+        with open(os.path.join(workdir, f'{FORMAT_NAME}.tex'), 'w', encoding='utf-8') as f:
+            f.write(static + DUMP_MARKER + '\n\\begin{document}\n\\end{document}\n')
+        try:
+            subprocess.run(['pdflatex', '-ini', '-interaction=nonstopmode', '-halt-on-error',
+                            f'-jobname={FORMAT_NAME}', '&pdflatex', 'mylatexformat.ltx',
+                            f'{FORMAT_NAME}.tex'],
+                           cwd=workdir, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return None
+        built = os.path.join(workdir, f'{FORMAT_NAME}.fmt')
+        if not os.path.exists(built):
+            return None
+        os.makedirs(format_dir, exist_ok=True)
+        shutil.copyfile(built, format_path + '.tmp')
+        os.replace(format_path + '.tmp', format_path)
+    with open(stamp_path + '.tmp', 'w', encoding='utf-8') as f:
+        f.write(digest)
+    os.replace(stamp_path + '.tmp', stamp_path)
+    return format_dir
+
+
+class CompilePool:
+    """At most `workers` LaTeX processes at a time, each in its own temp dir
+
+    Given the resume preamble, compiles load it from a dumped format (see
+    build_format) instead of re-reading every package each time."""
+
+    def __init__(self, workers=DEFAULT_COMPILE_WORKERS, engine=None, timeout=COMPILE_TIMEOUT,
+                 preamble=None, format_dir=DEFAULT_FORMAT_DIR):
+        self.env = None
+        self.format_dir = None
+        if engine is None and preamble is not None:
+            self.format_dir = build_format(preamble, format_dir, timeout)
+        if self.format_dir is not None:
+            engine = ['pdflatex', f'-fmt={FORMAT_NAME}', '-interaction=nonstopmode', '-halt-on-error']
+            # A trailing separator keeps the default format search path
+            self.env = dict(os.environ, TEXFORMATS=self.format_dir + os.pathsep)
+        self.engine = engine or find_latex_engine()
+        if self.engine is None:
+            raise FileNotFoundError("Neither latexmk nor pdflatex was found on PATH")
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                            thread_name_prefix='latex')
+
+    def submit(self, source):
+        """Start compiling source; returns a Future of a CompileResult"""
+        return self._executor.submit(compile_latex, source, self.engine, self.timeout, env=self.env)
+
+    def compile(self, source):
+        return self.submit(source).result()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def fit_one_page(pool, render, steps):
+    """Find the smallest tightening step whose compiled PDF fits on one page
+
+    render(step) returns the LaTeX for a budget tightened by step units, and
+    page count must not grow as step increases. The search compiles up to
+    pool.workers probes per round, so a resume costs a logarithmic number
+    of compiles in steps. Returns (step, source, result), or None if even
+    the tightest budget spills onto a second page or a compile fails."""
+    sources = {}
+    results = {}
+
+    def probe(step_list):
+        futures = {}
+        for step in step_list:
+            source = sources.get(step)
+            if source is None:
+                source = sources[step] = render(step)
+            # Neighbouring budgets often select the same bullets
+            if source not in results and source not in futures:
+                futures[source] = pool.submit(source)
+        for source, future in futures.items():
+            results[source] = future.result()
+        return [results[sources[step]] for step in step_list]
+
+    def fits(result):
+        return result.ok and result.pages <= 1
+
+    first, = probe([0])
+    if fits(first) or not first.ok:
+        return (0, sources[0], first) if first.ok else None
+    last, = probe([steps])
+    if not fits(last):
+        return None
+
+    low, high = 0, steps  # low overflows, high fits
+    while high - low > 1:
+        count = min(pool.workers, high - low - 1)
+        candidates = sorted({low + (high - low) * (i + 1) // (count + 1) for i in range(count)})
+        for step, result in zip(candidates, probe(candidates)):
+            if not result.ok:
+                return None
+            if fits(result):
+                high = step
+                break
+            low = step
+    return high, sources[high], results[sources[high]]
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+LaTeX Scanner for Resume Optimizer
+Tokenizes resume sections into macros, brace groups, comments and text runs
+in one linear pass, handling nested braces and escaped characters
+"""
+
+import re
+from functools import lru_cache
+
+# Macros whose arguments are not prose and must never be rewritten
+VERBATIM_ARG_MACROS = frozenset({'href', 'url', 'input', 'include', 'usepackage', 'documentclass',
+                                 'begin', 'end', 'vspace', 'hspace', 'label', 'ref'})
+
+_SPECIAL_CHARS = re.compile(r'[{}\\%]')
+
+
+class Node:
+    """A span [start, end) of the scanned source"""
+    __slots__ = ('start', 'end')
+
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+
+
+class Text(Node):
+    """A run of plain characters"""
+    __slots__ = ()
+
+
+class Comment(Node):
+    """A % comment up to (not including) the end of the line"""
+    __slots__ = ()
+
+
+class Group(Node):
+    """A {...} brace group; start/end include the braces"""
+    __slots__ = ('children',)
+
+    def __init__(self, start, end=None):
+        super().__init__(start, end)
+        self.children = []
+
+
+class Macro(Node):
+    """A control sequence and the brace groups that directly follow it"""
+    __slots__ = ('name', 'args')
+
+    def __init__(self, start, end, name):
+        super().__init__(start, end)
+        self.name = name
+        self.args = []
+
+
+class Document(Group):
+    """Root of a scanned source"""
+    __slots__ = ('source',)
+
+    def __init__(self, source):
+        super().__init__(0, len(source))
+        self.source = source
+
+    def text_of(self, node):
+        """Return the exact source of a node"""
+        return self.source[node.start:node.end]
+
+    def arg_text(self, macro, index=0):
+        """Return the source inside the braces of a macro argument"""
+        arg = macro.args[index]
+        return self.source[arg.start + 1:arg.end - 1]
+
+    def walk(self):
+        """Yield every node in document order"""
+        stack = [iter(self.children)]
+        while stack:
+            node = next(stack[-1], None)
+            if node is None:
+                stack.pop()
+                continue
+            yield node
+            if isinstance(node, Macro):
+                stack.append(iter(node.args))
+            elif isinstance(node, Group):
+                stack.append(iter(node.children))
+
+    def macros(self, *names):
+        """Yield the macros with any of the given names in document order"""
+        names = set(names)
+        for node in self.walk():
+            if isinstance(node, Macro) and node.name in names:
+                yield node
+
+    def text_runs(self):
+        """Yield the Text nodes that hold prose, skipping verbatim arguments"""
+        stack = [iter(self.children)]
+        while stack:
+            node = next(stack[-1], None)
+            if node is None:
+                stack.pop()
+            elif isinstance(node, Text):
+                yield node
+            elif isinstance(node, Macro):
+                if node.name not in VERBATIM_ARG_MACROS:
+                    stack.append(iter(node.args))
+                elif node.name == 'href' and len(node.args) > 1:
+                    # Only the link target is verbatim, the label is prose
+                    stack.append(iter(node.args[1:]))
+            elif isinstance(node, Group):
+                stack.append(iter(node.children))
+
+    def entry_spans(self, heading, end='resumeItemListEnd'):
+        """Return (start, end) spans from each heading macro to its closing macro
+
+        A span starts at the beginning of the heading's line and stops after
+        the first closing macro, or before the next heading if none follows."""
+        marks = [(node.start, node.end, node.name == heading)
+                 for node in self.macros(heading, end)]
+        spans = []
+        open_start = None
+        last_end = None
+        for start, stop, is_heading in marks:
+            if is_heading:
+                if open_start is not None:
+                    spans.append((open_start, self._trim_end(last_end, start)))
+                line_start = self.source.rfind('\n', 0, start) + 1
+                open_start = line_start if not self.source[line_start:start].strip() else start
+                last_end = stop
+            elif open_start is not None:
+                spans.append((open_start, stop))
+                open_start = None
+        if open_start is not None:
+            spans.append((open_start, self._trim_end(last_end, len(self.source))))
+        return spans
+
+    def _trim_end(self, minimum, limit):
+        """Back off trailing whitespace before limit without passing minimum"""
+        end = limit
+        while end > minimum and self.source[end - 1].isspace():
+            end -= 1
+        return end
+
+
+def _scan(source):
+    """Build the node tree for source in a single left-to-right pass"""
+    document = Document(source)
+    stack = [document]
+    length = len(source)
+    pending = None  # macro that may still take brace arguments
+    i = 0
+    text_start = None
+
+    def flush_text(upto):
+        if text_start is not None and upto > text_start:
+            stack[-1].children.append(Text(text_start, upto))
+
+    while i < length:
+        ch = source[i]
+
+        if ch == '{':
+            flush_text(i)
+            text_start = None
+            group = Group(i)
+            if pending is not None:
+                pending.args.append(group)
+            else:
+                stack[-1].children.append(group)
+            stack.append(group)
+            pending = None
+            i += 1
+
+        elif ch == '}':
+            flush_text(i)
+            text_start = None
+            pending = None
+            if len(stack) > 1:
+                group = stack.pop()
+                group.end = i + 1
+                owner = _owner_macro(stack[-1], group)
+                if owner is not None:
+                    owner.end = group.end
+                    pending = owner
+            i += 1
+
+        elif ch == '\\':
+            flush_text(i)
+            text_start = None
+            j = i + 1
+            while j < length and source[j].isalpha():
+                j += 1
+            if j == i + 1 and j < length:
+                # Control symbol such as \%, \& or \\
+                j += 1
+                macro = Macro(i, j, source[i + 1:j])
+                stack[-1].children.append(macro)
+                pending = None
+            else:
+                macro = Macro(i, j, source[i + 1:j])
+                stack[-1].children.append(macro)
+                pending = macro
+            i = j
+
+        elif ch == '%':
+            flush_text(i)
+            text_start = None
+            j = source.find('\n', i)
+            j = length if j == -1 else j
+            stack[-1].children.append(Comment(i, j))
+            pending = None
+            i = j
+
+        elif ch.isspace() and pending is not None:
+            # Whitespace (but not a blank line) may separate a macro from its arguments
+            j = i
+            newlines = 0
+            while j < length and source[j].isspace():
+                newlines += source[j] == '\n'
+                j += 1
+            if j < length and source[j] == '{' and newlines < 2:
+                i = j
+            else:
+                pending = None
+                text_start = i
+                i = j
+
+        else:
+            # Plain text runs up to the next special character
+            if text_start is None:
+                text_start = i
+            pending = None
+            special = _SPECIAL_CHARS.search(source, i + 1)
+            i = special.start() if special else length
+
+    flush_text(length)
+    # Close any groups left open by unbalanced input
+    while len(stack) > 1:
+        group = stack.pop()
+        group.end = length
+        owner = _owner_macro(stack[-1], group)
+        if owner is not None:
+            owner.end = length
+    return document
+
+
+def _owner_macro(container, group):
+    """Return the macro in container that owns group as an argument, if any"""
+    if container.children:
+        last = container.children[-1]
+        if isinstance(last, Macro) and last.args and last.args[-1] is group:
+            return last
+    return None
+
+
+@lru_cache(maxsize=256)
+def parse(source):
+    """Scan source into a Document; repeated calls with the same text are free
+
+    Documents are shared between callers and must be treated as read-only."""
+    return _scan(source)
+
+
+def replace_spans(source, replacements):
+    """Return source with each (start, end, text) span replaced
+
+    Spans must not overlap."""
+    parts = []
+    position = 0
+    for start, end, text in sorted(replacements, key=lambda item: item[0]):
+        parts.append(source[position:start])
+        parts.append(text)
+        position = end
+    parts.append(source[position:])
+    return ''.join(parts)
+
+
+def rewrite_text(source, rewrite):
+    """Apply rewrite() to every prose text run of source"""
+    document = parse(source)
+    replacements = []
+    for node in document.text_runs():
+        original = source[node.start:node.end]
+        rewritten = rewrite(original)
+        if rewritten != original:
+            replacements.append((node.start, node.end, rewritten))
+    return replace_spans(source, replacements) if replacements else source
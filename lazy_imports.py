@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Lazy Imports for Resume Optimizer
+Defers loading heavy modules until one of their attributes is first used,
+so commands that never touch them (e.g. --help) start quickly
+"""
+
+import sys
+import importlib.util
+
+
+def lazy_import(name):
+    """Return module name, executed on first attribute access
+
+    An already imported module is returned as-is."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
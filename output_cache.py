@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Output Cache for Resume Optimizer
+Content-addressed store of generated resumes, keyed by the job description
+and everything else the output depends on, with size-bounded LRU eviction
+"""
+
+import os
+import pickle
+import hashlib
+
+from keyword_engine import CACHE_DIR
+
+DEFAULT_OUTPUT_CACHE_DIR = os.path.join(CACHE_DIR, 'outputs')
+DEFAULT_OUTPUT_CACHE_MB = 256
+
+ENTRY_SUFFIX = '.pickle'
+
+# Eviction frees this much headroom below max_bytes, so it runs rarely
+EVICT_TO = 0.9
+
+
+def normalize_job_description(text):
+    """Canonical form of a job description for cache keys
+
+    Only differences the optimizer cannot see are removed: keyword matching
+    is case-insensitive, surrounding whitespace is never matched and line
+    endings are equivalent."""
+    return text.replace('\r\n', '\n').replace('\r', '\n').strip().lower()
+
+
+def cache_key(*parts):
+    """SHA-256 hex digest of strings and bytes, unambiguously concatenated"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode('utf-8')
+        digest.update(len(part).to_bytes(8, 'little'))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class OutputCache:
+    """Pickled outputs in cache_dir/<key[:2]>/<key>.pickle
+
+    Reads refresh an entry's modification time, and writes evict the least
+    recently used entries once the directory grows past max_bytes. Entries
+    are written atomically, so several processes can share one cache."""
+
+    def __init__(self, cache_dir=DEFAULT_OUTPUT_CACHE_DIR, max_bytes=DEFAULT_OUTPUT_CACHE_MB << 20):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ENTRY_SUFFIX)
+
+    def get(self, key):
+        """The stored value for key, or None"""
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        else:
+            self._size += len(data)
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        """(path, size, last use) of every stored entry"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.name.endswith(ENTRY_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                yield entry.path, stat.st_size, stat.st_mtime
+
+    def evict(self):
+        """Remove least recently used entries until the cache is well under max_bytes"""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        size = sum(entry[1] for entry in entries)
+        for path, entry_size, _ in entries:
+            if size <= self.max_bytes * EVICT_TO:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            size -= entry_size
+        self._size = size
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Page Estimator for Resume Optimizer
+Predicts the typeset height of resume blocks from the template's spacing
+rules and the font metrics, so one-page fit can be checked without LaTeX
+"""
+
+import re
+import math
+from functools import lru_cache
+
+from latex_scanner import parse, Text, Comment, Group, Macro
+from font_metrics import line_count, string_width, POINTS_PER_INCH, TEXT_WIDTH_PT
+
+# Usable page height: fullpage leaves 9in on letterpaper, the preamble adds 1.5in
+TEXT_HEIGHT_PT = 10.5 * POINTS_PER_INCH
+
+# (font size, baselineskip) in points for the size commands of an 11pt article
+FONT_SIZES = {
+    'tiny': (6.0, 7.0),
+    'scriptsize': (8.0, 9.5),
+    'footnotesize': (9.0, 11.0),
+    'small': (10.0, 12.0),
+    'normalsize': (10.95, 13.6),
+    'large': (12.0, 14.0),
+    'Large': (14.4, 18.0),
+    'LARGE': (17.28, 22.0),
+    'huge': (20.74, 25.0),
+    'Huge': (24.88, 30.0),
+}
+NORMAL_SIZE = FONT_SIZES['normalsize']
+SMALL_SIZE = FONT_SIZES['small']
+
+# Lato's x-height is 0.5065em, which sets the ex-based titlesec spacing
+EX_PT = 0.5065 * NORMAL_SIZE[0]
+
+# List spacing of an 11pt article by nesting level: \topsep before and after
+# the list, and \itemsep + \parsep between items
+LIST_TOPSEP = (9.0, 9.0, 4.5, 2.25)
+LIST_ITEM_SEP = (9.0, 9.0, 4.0, 2.0)
+LIST_INDENT_PT = 0.15 * POINTS_PER_INCH
+
+# \section: titlesec's default 3.5ex before and 2.3ex after, plus the
+# \vspace{-13pt}, the \large title, the rule and the \vspace{-5pt} of \titleformat
+RULE_PT = 0.4
+SECTION_PT = 3.5 * EX_PT - 13.0 + FONT_SIZES['large'][1] + RULE_PT - 5.0 + 2.3 * EX_PT
+
+# Heading macros from the preamble, excluding the item separation
+SUBHEADING_PT = -2.0 + NORMAL_SIZE[1] - 7.0   # \vspace{-2pt} \item ... \vspace{-7pt}
+PROJECT_HEADING_PT = SMALL_SIZE[1] - 7.0       # one \small tabular row, \vspace{-7pt}
+ITEM_LIST_END_PT = -5.0                        # \resumeItemListEnd's \vspace{-5pt}
+ITEM_TRAILING_PT = -2.0                        # \resumeItem's \vspace{-2pt}
+
+# Resolution of the integer heights handed to the bullet packer
+HEIGHT_UNITS_PER_PT = 2
+
+LIST_ENVIRONMENTS = frozenset({'itemize', 'enumerate', 'description'})
+TRIVLIST_ENVIRONMENTS = frozenset({'center', 'flushleft', 'flushright'})
+
+_LENGTH = re.compile(r'(-?\d*\.?\d+)\s*(pt|in|cm|mm|em|ex)')
+_UNITS = {'pt': 1.0, 'in': POINTS_PER_INCH, 'cm': POINTS_PER_INCH / 2.54,
+          'mm': POINTS_PER_INCH / 25.4, 'em': NORMAL_SIZE[0], 'ex': EX_PT}
+_SYMBOLS = frozenset({'%', '&', '$', '#', '_', '{', '}'})
+
+
+def parse_length(text):
+    """Convert a TeX length such as -2pt or 0.15in to points (0 if unknown)"""
+    match = _LENGTH.search(text)
+    if not match:
+        return 0.0
+    return float(match.group(1)) * _UNITS[match.group(2)]
+
+
+class _Measure:
+    """Walks a scanned block, summing the vertical space it takes"""
+    __slots__ = ('document', 'height', 'level', 'line_width', 'line_size', 'in_options')
+
+    def __init__(self, document, level=0):
+        self.document = document
+        self.height = 0.0
+        self.level = level
+        self.line_width = 0.0
+        self.line_size = None
+        # Inside the [...] options that may follow \begin{itemize}
+        self.in_options = False
+
+    def available_width(self):
+        return TEXT_WIDTH_PT - LIST_INDENT_PT * self.level
+
+    def add_text(self, text, size):
+        text = ' '.join(text.replace('$', '').replace('~', ' ').split())
+        if not text:
+            return
+        self.line_width += string_width(text, size[0])
+        if self.line_size is None or size[1] > self.line_size[1]:
+            self.line_size = size
+
+    def end_line(self):
+        """Close the current paragraph line, wrapping it to the available width"""
+        if self.line_size is not None:
+            lines = max(1, math.ceil(self.line_width / self.available_width()))
+            self.height += lines * self.line_size[1]
+        self.line_width = 0.0
+        self.line_size = None
+
+    def begin(self, environment):
+        self.end_line()
+        if environment in LIST_ENVIRONMENTS:
+            self.level += 1
+            self.height += LIST_TOPSEP[min(self.level, 3)]
+        elif environment in TRIVLIST_ENVIRONMENTS:
+            self.height += LIST_TOPSEP[min(self.level + 1, 3)]
+
+    def end(self, environment):
+        self.end_line()
+        if environment in LIST_ENVIRONMENTS:
+            self.height += LIST_TOPSEP[min(self.level, 3)]
+            self.level = max(self.level - 1, 0)
+        elif environment in TRIVLIST_ENVIRONMENTS:
+            self.height += LIST_TOPSEP[min(self.level + 1, 3)]
+
+    def item_sep(self, level=None):
+        return LIST_ITEM_SEP[min(self.level if level is None else level, 3)]
+
+    def walk(self, nodes, size=NORMAL_SIZE):
+        document = self.document
+        for node in nodes:
+            if isinstance(node, Text):
+                text = document.text_of(node)
+                if self.in_options:
+                    close = text.find(']')
+                    if close == -1:
+                        continue
+                    self.in_options = False
+                    text = text[close + 1:]
+                self.add_text(text, size)
+            elif self.in_options:
+                continue
+            elif isinstance(node, Comment):
+                continue
+            elif isinstance(node, Macro):
+                size = self.macro(node, size)
+            elif isinstance(node, Group):
+                self.walk(node.children, size)
+
+    def macro(self, node, size):
+        """Account for one macro; returns the font size in effect after it"""
+        name = node.name
+        document = self.document
+
+        if name in FONT_SIZES:
+            # Size switches last to the end of the enclosing group
+            size = FONT_SIZES[name]
+            self.walk(node.args, size)
+        elif name == '\\':
+            self.end_line()
+        elif name in _SYMBOLS:
+            self.add_text(name, size)
+        elif name in ('vspace', 'vspace*') and node.args:
+            self.height += parse_length(document.arg_text(node))
+        elif name == 'section':
+            self.end_line()
+            self.height += SECTION_PT
+        elif name in ('begin', 'end') and node.args:
+            environment = document.arg_text(node)
+            if name == 'begin':
+                self.begin(environment)
+                following = document.source[node.end:node.end + 1]
+                self.in_options = following == '['
+            else:
+                self.end(environment)
+            # Groups after the environment name are content, e.g. {\Huge Name}
+            self.walk(node.args[1:], size)
+        elif name in ('resumeSubHeadingListStart', 'resumeItemListStart'):
+            self.begin('itemize')
+        elif name == 'resumeSubHeadingListEnd':
+            self.end('itemize')
+        elif name == 'resumeItemListEnd':
+            self.end('itemize')
+            self.height += ITEM_LIST_END_PT
+        elif name == 'item':
+            self.end_line()
+            self.height += self.item_sep()
+            self.walk(node.args, size)
+        elif name == 'resumeSubheading':
+            self.end_line()
+            self.height += self.item_sep(max(self.level, 1)) + SUBHEADING_PT
+        elif name == 'resumeProjectHeading':
+            self.end_line()
+            self.height += self.item_sep(max(self.level, 1)) + PROJECT_HEADING_PT
+        elif name in ('resumeItem', 'resumeSubItem'):
+            # Always a second-level bullet set in \small
+            self.end_line()
+            lines = line_count(document.arg_text(node)) if node.args else 1
+            self.height += (self.item_sep(max(self.level, 2)) + lines * SMALL_SIZE[1]
+                            + ITEM_TRAILING_PT)
+        elif name == 'href' and len(node.args) > 1:
+            self.walk(node.args[1:], size)
+        elif name not in ('url', 'hspace', 'hfill', 'label', 'ref', 'input', 'vfill'):
+            # Formatting such as \textbf, \emph or \underline: measure the content
+            self.walk(node.args, size)
+        return size
+
+
+@lru_cache(maxsize=4096)
+def block_height(source, level=0):
+    """Height in points of a LaTeX block; memoized on its content
+
+    level is the list nesting the block sits in, e.g. 1 for an entry inside
+    \\resumeSubHeadingListStart."""
+    measure = _Measure(parse(source), level)
+    measure.walk(measure.document.children)
+    measure.end_line()
+    return measure.height
+
+
+def page_height(blocks):
+    """Total height in points of the body blocks of a page"""
+    return sum(block_height(block) for block in blocks)
+
+
+def layout_height(blocks, entries):
+    """Height of a candidate layout: top-level blocks plus rendered list entries"""
+    return page_height(blocks) + sum(block_height(entry, 1) for entry in entries)
+
+
+def fits_on_page(blocks, page_height_pt=TEXT_HEIGHT_PT):
+    """True if the blocks are estimated to fit on one page"""
+    return page_height(blocks) <= page_height_pt
+
+
+def height_units(points):
+    """Round a height up to whole packer units"""
+    return max(0, math.ceil(points * HEIGHT_UNITS_PER_PT - 1e-9))
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Stage Pipeline for Resume Optimizer
+A small dependency graph of named stages whose outputs are memoized on
+their inputs, with independent stages run side by side
+"""
+
+import time
+from collections import OrderedDict
+
+DEFAULT_MEMO_SIZE = 128
+
+_SCALARS = (str, bytes, int, float, bool, type(None))
+
+
+def freeze(value):
+    """Hashable, value-equal stand-in for value
+
+    Strings, numbers and lists, tuples, sets or dicts of them freeze to
+    themselves; anything else (e.g. a parsed SectionModel) raises TypeError."""
+    if isinstance(value, _SCALARS):
+        return value
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(freeze(item) for item in value))
+    if isinstance(value, (set, frozenset)):
+        return ('set', tuple(sorted(freeze(item) for item in value)))
+    if isinstance(value, dict):
+        return ('dict', tuple(sorted((freeze(k), freeze(v)) for k, v in value.items())))
+    raise TypeError(f"{type(value).__name__} has no value key")
+
+
+class Stage:
+    """One node of a Pipeline: output = func(*values of inputs)
+
+    memo is how many outputs to keep (least recently used first out);
+    0 recomputes the stage on every run."""
+    __slots__ = ('name', 'func', 'inputs', 'memo')
+
+    def __init__(self, name, func, inputs=(), memo=DEFAULT_MEMO_SIZE):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.memo = memo
+
+
+class PipelineRun:
+    """Values of a run, the seconds spent per computed stage and the stages served from memo"""
+    __slots__ = ('values', 'timings', 'hits')
+
+    def __init__(self, values, timings, hits):
+        self.values = values
+        self.timings = timings
+        self.hits = hits
+
+    def __getitem__(self, name):
+        return self.values[name]
+
+
+class Pipeline:
+    """Runs stages in dependency order, skipping those whose inputs were seen before
+
+    A stage's memo key is made of its inputs: the value itself for plain
+    data (so a stage depending on job_type reruns only when the job type
+    changes, not when the job description does), and the producing stage's
+    own key for objects that cannot be compared by value. Stages whose
+    inputs are ready at the same time are computed together on the
+    executor passed to run, if any."""
+
+    def __init__(self, stages):
+        self.stages = OrderedDict((stage.name, stage) for stage in stages)
+        self._memo = {name: OrderedDict() for name in self.stages}
+        self._orders = {}
+        names = set(self.stages)
+        seen = set()
+        for stage in self.stages.values():
+            # Listing stages in dependency order rules out cycles
+            for name in stage.inputs:
+                if name in names and name not in seen:
+                    raise ValueError(f"Stage {stage.name} is listed before its input {name}")
+            seen.add(stage.name)
+
+    def required(self, targets, given=()):
+        """Stage names needed to produce targets, in dependency order"""
+        plan = (tuple(targets), frozenset(given))
+        order = self._orders.get(plan)
+        if order is None:
+            order = self._orders[plan] = self._required(targets, given)
+        return order
+
+    def _required(self, targets, given):
+        needed = set()
+        pending = [name for name in targets if name not in given]
+        while pending:
+            name = pending.pop()
+            if name in needed or name not in self.stages:
+                continue
+            needed.add(name)
+            pending.extend(input_name for input_name in self.stages[name].inputs
+                           if input_name not in given)
+        return [name for name in self.stages if name in needed]
+
+    def call(self, name, *values):
+        """Output of one stage for the given input values, through its memo"""
+        stage = self.stages[name]
+        memo = self._memo[name]
+        memo_key = tuple(freeze(value) for value in values)
+        if memo_key in memo:
+            memo.move_to_end(memo_key)
+            return memo[memo_key]
+        value = stage.func(*values)
+        self._store(stage, memo_key, value)
+        return value
+
+    def _store(self, stage, memo_key, value):
+        if stage.memo:
+            memo = self._memo[stage.name]
+            memo[memo_key] = value
+            if len(memo) > stage.memo:
+                memo.popitem(last=False)
+
+    def clear(self):
+        for memo in self._memo.values():
+            memo.clear()
+
+    def run(self, inputs, targets=None, executor=None):
+        """Compute targets (default: every stage) from inputs
+
+        inputs maps the names of the graph's sources, and optionally of any
+        stage to override, to values. Returns a PipelineRun."""
+        order = self.required(targets or list(self.stages), inputs)
+        values = dict(inputs)
+        keys = {}
+        timings = {}
+        hits = []
+
+        def key_of(name):
+            if name not in keys:
+                keys[name] = freeze(values[name])
+            return keys[name]
+
+        def compute(stage):
+            start = time.perf_counter()
+            value = stage.func(*[values[name] for name in stage.inputs])
+            return value, time.perf_counter() - start
+
+        while order:
+            # Every stage whose inputs are all resolved forms the next wave
+            wave = [name for name in order if all(
+                input_name in values for input_name in self.stages[name].inputs)]
+            if not wave:
+                missing = {input_name for name in order for input_name in self.stages[name].inputs
+                           if input_name not in values and input_name not in self.stages}
+                raise KeyError(f"Missing pipeline inputs: {', '.join(sorted(missing))}")
+            order = [name for name in order if name not in wave]
+            misses = []
+            for name in wave:
+                stage = self.stages[name]
+                memo_key = tuple(key_of(input_name) for input_name in stage.inputs)
+                memo = self._memo[name]
+                if stage.memo and memo_key in memo:
+                    memo.move_to_end(memo_key)
+                    values[name] = memo[memo_key]
+                    hits.append(name)
+                else:
+                    misses.append((stage, memo_key))
+                # Unfreezable outputs are identified by how they were derived
+                keys[name] = (name, memo_key)
+            if executor is not None and len(misses) > 1:
+                futures = [executor.submit(compute, stage) for stage, _ in misses]
+                results = [future.result() for future in futures]
+            else:
+                results = [compute(stage) for stage, _ in misses]
+            for (stage, memo_key), (value, seconds) in zip(misses, results):
+                values[stage.name] = value
+                timings[stage.name] = seconds
+                self._store(stage, memo_key, value)
+            # Plain-data outputs are keyed by value from here on
+            for name in wave:
+                try:
+                    keys[name] = freeze(values[name])
+                except TypeError:
+                    pass
+        return PipelineRun(values, timings, hits)
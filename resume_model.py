@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Resume Model for Resume Optimizer
+Compact, parsed view of the experience and project entries of a section,
+with an inverted keyword index for scoring them
+"""
+
+import re
+import heapq
+
+from latex_scanner import parse, replace_spans
+from keyword_engine import get_default_matcher
+from font_metrics import line_count
+
+_TOKEN = re.compile(r'[a-z0-9][a-z0-9+#]*(?:[./-][a-z0-9+#]+)*')
+
+
+def tokenize(text):
+    """Lowercase word tokens, keeping forms like node.js, c++, tcp/ip and full-stack intact"""
+    return _TOKEN.findall(text.lower())
+
+
+def visible_text(source):
+    """Join the prose text runs of a LaTeX snippet"""
+    document = parse(source)
+    return ' '.join(source[node.start:node.end] for node in document.text_runs())
+
+
+class Bullet:
+    """One \\resumeItem of an entry; start/end locate it in the entry source"""
+    __slots__ = ('source', 'content', 'text', 'tokens', 'lines', 'start', 'end')
+
+    def __init__(self, source, content, start, end):
+        self.source = source
+        self.content = content
+        self.text = visible_text(content)
+        self.tokens = frozenset(tokenize(self.text))
+        # Rendered line count from the font metrics of the \small bullet text
+        self.lines = line_count(content)
+        self.start = start
+        self.end = end
+
+
+class ResumeEntry:
+    """An experience or project entry: heading macro plus its bullets"""
+    __slots__ = ('source', 'heading', 'bullets', 'tokens')
+
+    def __init__(self, source):
+        document = parse(source)
+        self.source = source
+        heading = next(document.macros('resumeSubheading', 'resumeProjectHeading'), None)
+        self.heading = document.text_of(heading) if heading is not None else ''
+        self.bullets = []
+        for item in document.macros('resumeItem'):
+            if item.args:
+                self.bullets.append(Bullet(document.text_of(item), document.arg_text(item),
+                                           item.start, item.end))
+        self.tokens = frozenset(tokenize(visible_text(source)))
+
+    def render(self, bullet_ids):
+        """Return the entry source keeping only the given bullets"""
+        keep = set(bullet_ids)
+        if len(keep) == len(self.bullets):
+            return self.source
+        removals = []
+        for bullet_id, bullet in enumerate(self.bullets):
+            if bullet_id in keep:
+                continue
+            # Drop the whole line when the bullet sits on a line of its own
+            start, end = bullet.start, bullet.end
+            line_start = self.source.rfind('\n', 0, start) + 1
+            line_end = self.source.find('\n', end)
+            line_end = len(self.source) if line_end == -1 else line_end
+            if not self.source[line_start:start].strip() and not self.source[end:line_end].strip():
+                start, end = max(line_start - 1, 0), line_end
+            removals.append((start, end, ''))
+        return replace_spans(self.source, removals)
+
+
+class KeywordIndex:
+    """Inverted index from term to the entries and bullets that mention it
+
+    Terms are the taxonomy keywords found in the text (aliases resolved to
+    their canonical form) plus the plain word tokens."""
+    __slots__ = ('entries', 'bullets')
+
+    def __init__(self, entries, matcher):
+        entry_postings = {}
+        bullet_postings = {}
+        for entry_id, entry in enumerate(entries):
+            entry_terms = set(entry.tokens)
+            entry_terms.update(matcher.extract(visible_text(entry.source)))
+            for term in entry_terms:
+                entry_postings.setdefault(term, []).append(entry_id)
+            for bullet_id, bullet in enumerate(entry.bullets):
+                bullet_terms = set(bullet.tokens)
+                bullet_terms.update(matcher.extract(bullet.text))
+                for term in bullet_terms:
+                    bullet_postings.setdefault(term, []).append((entry_id, bullet_id))
+        self.entries = {term: tuple(ids) for term, ids in entry_postings.items()}
+        self.bullets = {term: tuple(ids) for term, ids in bullet_postings.items()}
+
+    def score_entries(self, term_weights):
+        """Sum the weights of matched terms per entry, touching only their postings"""
+        scores = {}
+        for term, weight in term_weights.items():
+            for entry_id in self.entries.get(term, ()):
+                scores[entry_id] = scores.get(entry_id, 0.0) + weight
+        return scores
+
+    def top_entries(self, term_weights, k):
+        """Return the ids of the k best-scoring entries, best first
+
+        Ties go to the entry listed first. Entries that match nothing are
+        not returned, so the result may hold fewer than k ids."""
+        scores = self.score_entries(term_weights)
+        best = heapq.nsmallest(k, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [entry_id for entry_id, score in best if score > 0]
+
+    def score_bullets(self, term_weights):
+        """Sum the weights of matched terms per (entry_id, bullet_id)"""
+        scores = {}
+        for term, weight in term_weights.items():
+            for key in self.bullets.get(term, ()):
+                scores[key] = scores.get(key, 0.0) + weight
+        return scores
+
+
+class SectionModel:
+    """A section split into its entries and the text around them"""
+    __slots__ = ('source', 'entries', 'spans', 'index')
+
+    def __init__(self, source, heading_macro):
+        self.source = source
+        self.spans = parse(source).entry_spans(heading_macro)
+        self.entries = [ResumeEntry(source[start:end]) for start, end in self.spans]
+        self.index = KeywordIndex(self.entries, get_default_matcher())
+
+    @property
+    def prefix(self):
+        """Text before the first entry (section title, list start)"""
+        return self.source[:self.spans[0][0]] if self.spans else self.source
+
+    @property
+    def suffix(self):
+        """Text after the last entry (list end)"""
+        return self.source[self.spans[-1][1]:] if self.spans else ''
+
+    def render(self, selection):
+        """Rebuild the section from {entry_id: bullet_ids}, in file order"""
+        if not self.spans:
+            return self.source
+        parts = [self.prefix]
+        previous_end = None
+        for entry_id, (start, end) in enumerate(self.spans):
+            if entry_id not in selection:
+                continue
+            if previous_end is not None:
+                parts.append(self.source[previous_end:start] if previous_end == self.spans[entry_id - 1][1] else '\n\n')
+            parts.append(self.entries[entry_id].render(selection[entry_id]))
+            previous_end = end
+        parts.append(self.suffix)
+        return ''.join(parts)
+
@@ -9,83 +9,271 @@ Author: Subhadra Mishra
 import re
 import os
 import sys
-from datetime import datetime
+import math
+import time
+import logging
+import argparse
+from datetime import datetime, timezone
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from keyword_engine import BASE_DIR, DEFAULT_TAXONOMY, get_default_matcher, build_keyword_matrix
+from idf_index import get_default_idf_index, ingest_corpus
+from job_classifier import get_default_job_index, GENERAL_JOB_TYPE
+from job_model import JobTypeModel, DEFAULT_MODEL_DIR, train_job_model
+from rewrite_engine import get_rewrite_engine
+from latex_scanner import parse, replace_spans, rewrite_text
+from resume_model import SectionModel
+from font_metrics import line_count, trim_to_lines, MAX_BULLET_LINES
+from bullet_packer import (PackGroup, pack_bullets, EXPERIENCE_HEADING_LINES,
+                           PROJECT_HEADING_LINES, BASE_BULLET_VALUE)
+from batch_runner import run_batch, DEFAULT_BATCH_WORKERS
+from watch_mode import watch
+from resume_server import run_server, DEFAULT_HOST, DEFAULT_PORT
+from latex_compiler import CompilePool, fit_one_page, DEFAULT_COMPILE_WORKERS
+from page_estimator import (block_height, page_height, layout_height, height_units,
+                            TEXT_HEIGHT_PT, HEIGHT_UNITS_PER_PT)
+from resume_template import ResumeTemplate, write_chunks
+from pipeline import Pipeline, Stage
+from output_cache import (OutputCache, cache_key, normalize_job_description,
+                          DEFAULT_OUTPUT_CACHE_DIR, DEFAULT_OUTPUT_CACHE_MB)
+
+PROJECTS_SECTION_START = """%-----------PROJECTS-----------%
+\\section{Projects}
+\\resumeSubHeadingListStart"""
+PROJECTS_SECTION_END = "\n\n\\resumeSubHeadingListEnd"
+
+# Static LaTeX preamble shared by every generated resume
+PREAMBLE_PATH = os.path.join(BASE_DIR, 'preamble.tex')
+
+# Resume sections and their files in src/
+SECTION_FILES = {
+    'heading': 'heading.tex',
+    'education': 'education.tex',
+    'skills': 'skills.tex',
+    'experience': 'experience.tex',
+    'projects': 'projects.tex'
+}
+
+# Repacks allowed when the estimated page still overflows after packing
+MAX_FIT_ATTEMPTS = 5
+
+# Page height removed per step when a compiled resume spills onto page two
+COMPILE_STEP_PT = 12.0
+
+# Bump when a change alters the generated LaTeX, so cached outputs are not reused
+OPTIMIZER_VERSION = 2
+
+# Progress messages; silent unless the application configures logging
+# (the NullHandler keeps logging.lastResort from printing warnings to stderr)
+logger = logging.getLogger('resume_optimizer')
+logger.addHandler(logging.NullHandler())
+_cli_handler = None
+
+class ResumeResult:
+    """A generated resume held in memory
+    
+    The LaTeX is kept as template chunks and only joined when .latex is
+    read, so save() can stream them straight to the file. filename is where
+    save() writes it; timings holds the seconds spent per stage, and cached
+    is set when the resume came from the output cache."""
+    __slots__ = ('chunks', 'keywords', 'job_type', 'filename', 'timings', 'pdf', 'cached')
+    
+    def __init__(self, chunks, keywords, job_type, filename, timings, pdf=None, cached=False):
+        self.chunks = chunks
+        self.keywords = keywords
+        self.job_type = job_type
+        self.filename = filename
+        self.timings = timings
+        self.pdf = pdf
+        self.cached = cached
+    
+    @property
+    def latex(self):
+        if len(self.chunks) != 1:
+            self.chunks = [''.join(self.chunks)]
+        return self.chunks[0]
+    
+    def write_to(self, stream):
+        """Write the LaTeX to an open text stream"""
+        stream.writelines(self.chunks)
+    
+    def save(self, filename=None):
+        """Write the LaTeX (and the PDF next to it, if compiled); returns the .tex path"""
+        filename = filename or self.filename
+        write_chunks(filename, self.chunks)
+        if self.pdf is not None:
+            with open(self.pdf_filename(filename), 'wb') as f:
+                f.write(self.pdf)
+        return filename
+    
+    def pdf_filename(self, filename=None):
+        return os.path.splitext(filename or self.filename)[0] + '.pdf'
 
 class ResumeOptimizer:
-    def __init__(self):
+    def __init__(self, job_model=None, project_count=None, line_budget=None,
+                 trim_long_bullets=False, deterministic=False, output_cache=None, stage_workers=1,
+                 warm_start=False):
         self.src_path = "src"
+        with open(PREAMBLE_PATH, 'r', encoding='utf-8') as f:
+            self.preamble = f.read()
         self.sections = {}
+        # project_count caps the candidate projects (None considers all of
+        # them); line_budget bounds experience + projects in rendered lines
+        # (None fits them to the estimated free page height)
+        self.project_count = project_count
+        self.line_budget = line_budget
+        # Bullets wrapping past MAX_BULLET_LINES are cut at a clause boundary
+        # when trim_long_bullets is set, and only reported otherwise
+        self.trim_long_bullets = trim_long_bullets
+        # An OutputCache serves repeated job descriptions without recomputing;
+        # cached resumes must be reproducible, so it implies deterministic
+        # (the Generated: line then comes from SOURCE_DATE_EPOCH, not the clock)
+        self.output_cache = output_cache
+        self.deterministic = deterministic or output_cache is not None
+        self._source_digest = None
+        # Independent stages (skills, experience, projects) share these threads
+        self.stage_executor = (ThreadPoolExecutor(max_workers=stage_workers, thread_name_prefix='stage')
+                               if stage_workers > 1 else None)
+        self.pipeline = self.build_pipeline()
+        # Optional trained JobTypeModel (or the folder it was saved to)
+        # that replaces the rule-based job type detection
+        if isinstance(job_model, str):
+            job_model = JobTypeModel.load(job_model)
+        self.job_model = job_model
+        # Precompute every job type's section variants whenever sections load
+        self.warm_start = warm_start
         self.load_sections()
     
     def load_sections(self):
         """Load resume sections from src/ folder"""
-        required_files = {
-            'heading': 'heading.tex',
-            'education': 'education.tex',
-            'skills': 'skills.tex', 
-            'experience': 'experience.tex',
-            'projects': 'projects.tex'
-        }
-        
         missing_files = []
-        for section, filename in required_files.items():
+        for section, filename in SECTION_FILES.items():
             filepath = os.path.join(self.src_path, filename)
             try:
                 with open(filepath, 'r', encoding='utf-8') as f:
                     self.sections[section] = f.read().strip()
-                print(f"✅ Loaded {filename}")
+                logger.info("✅ Loaded %s", filename)
             except FileNotFoundError:
                 missing_files.append(filename)
                 self.sections[section] = ""
         
+        self._source_digest = None
+        if self.warm_start:
+            self.warm_up()
+        
         if missing_files:
-            print(f"❌ Missing files in src/: {', '.join(missing_files)}")
-            print("Please ensure all LaTeX files are in the src/ folder")
+            logger.error("❌ Missing files in src/: %s", ', '.join(missing_files))
+            logger.error("Please ensure all LaTeX files are in the src/ folder")
             return False
         
         return True
     
+    def watched_paths(self):
+        """Files the output depends on, mapped to their section (None for the preamble)"""
+        paths = {os.path.join(self.src_path, filename): section
+                 for section, filename in SECTION_FILES.items()}
+        paths[PREAMBLE_PATH] = None
+        return paths
+    
+    def reload_sections(self, paths):
+        """Re-read only the given files from watched_paths
+        
+        Stages memoize on content, so only those depending on a section
+        that actually changed run again (eagerly for every job type with
+        warm_start). Returns the changed section names
+        ('preamble' for preamble.tex)."""
+        sections = self.watched_paths()
+        changed = []
+        for path in paths:
+            if path not in sections:
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            except OSError as e:
+                logger.warning("⚠️  Could not read %s, keeping the previous version: %s", path, e)
+                continue
+            section = sections[path]
+            if section is None:
+                if content != self.preamble:
+                    self.preamble = content
+                    changed.append('preamble')
+            elif content.strip() != self.sections[section]:
+                self.sections[section] = content.strip()
+                changed.append(section)
+        if changed:
+            self._source_digest = None
+            if self.warm_start:
+                self.warm_up()
+        return changed
+    
+    def job_types(self):
+        """Every job type detect_job_type can return"""
+        if self.job_model is not None:
+            job_types = list(self.job_model.labels)
+        else:
+            job_types = list(get_default_job_index().job_types)
+        if GENERAL_JOB_TYPE not in job_types:
+            job_types.append(GENERAL_JOB_TYPE)
+        return job_types
+    
+    def warm_up(self):
+        """Precompute the job-type-only stages for every job type
+        
+        Skills, the rewritten experience and projects and the template are
+        held in the pipeline's memo, their block heights in the page
+        estimator's, and the keyword matcher, IDF index and job type index
+        are loaded, so a request only pays for keyword extraction, bullet
+        selection and assembly."""
+        start = time.perf_counter()
+        get_default_matcher()
+        get_default_idf_index().idf()
+        get_default_job_index()
+        self.pipeline.call('template', self.preamble, self.sections['heading'], self.sections['education'])
+        for job_type in self.job_types():
+            self.pipeline.call('skills', job_type, self.sections['skills'])
+            self.optimized_section('experience', job_type)
+            self.optimized_section('projects', job_type)
+            # Fills the memoized heights of every block and bullet of the job type
+            self.select_bullets(job_type, {})
+        logger.info("🔥 Precomputed sections for %d job types in %.0fms",
+                    len(self.job_types()), (time.perf_counter() - start) * 1000)
+    
     def extract_keywords(self, job_description):
         """Extract relevant keywords from job description for ATS optimization"""
-        jd = job_description.lower()
-        keywords = set()
-        
-        technical_patterns = {
-            'languages': r'\b(python|java|javascript|typescript|sql|r|scala|go|c\+\+)\b',
-            'frameworks': r'\b(react|angular|vue|node\.?js|django|flask|spring|express)\b',
-            'cloud': r'\b(aws|azure|gcp|docker|kubernetes|jenkins|git)\b',
-            'databases': r'\b(postgresql|mysql|mongodb|redis|snowflake|oracle)\b',
-            'data_tools': r'\b(spark|hadoop|kafka|tableau|power bi|looker)\b',
-            'networking': r'\b(cisco|routing|switching|tcp/ip|dns|dhcp|network|connectivity|service desk|troubleshooting|configuration|documentation)\b',
-            'concepts': r'\b(machine learning|data science|devops|microservices|ci/cd|agile|scrum)\b'
-        }
-        
-        for category, pattern in technical_patterns.items():
-            matches = re.findall(pattern, jd)
-            keywords.update(matches)
-        
-        return sorted(list(keywords))
+        return get_default_matcher().extract(job_description)
+    
+    def extract_weighted_keywords(self, job_description):
+        """Score keywords by in-JD frequency (sublinear TF) times corpus IDF"""
+        matcher = get_default_matcher()
+        counts = Counter(term_id for _, _, term_id in matcher.finditer(job_description))
+        idf = get_default_idf_index().idf()
+        
+        weighted = [(matcher.terms[term_id], (1.0 + math.log(count)) * float(idf[term_id]))
+                    for term_id, count in counts.items()]
+        weighted.sort(key=lambda item: (-item[1], item[0]))
+        return weighted
+    
+    def extract_keyword_matrix(self, job_descriptions):
+        """Extract keyword counts for many job descriptions as a sparse CSR matrix"""
+        return build_keyword_matrix(get_default_matcher(), job_descriptions)
     
     def detect_job_type(self, keywords):
         """Automatically detect job type based on extracted keywords"""
-        kw_str = ' '.join(keywords).lower()
-        
-        data_engineering_indicators = ['data engineer', 'etl', 'pipeline', 'spark', 'hadoop', 'kafka']
-        data_analyst_indicators = ['data analyst', 'analytics', 'bi', 'tableau', 'power bi']
-        software_engineer_indicators = ['software engineer', 'full stack', 'react', 'frontend', 'backend']
-        network_engineer_indicators = ['network engineer', 'cisco', 'routing', 'switching', 'tcp/ip', 'dns', 'dhcp', 'network connectivity', 'service desk', 'troubleshooting']
-        
-        if any(term in kw_str for term in network_engineer_indicators):
-            return 'network_engineer'
-        elif any(term in kw_str for term in data_engineering_indicators):
-            return 'data_engineering'
-        elif any(term in kw_str for term in data_analyst_indicators):
-            return 'data_analyst'
-        elif any(term in kw_str for term in software_engineer_indicators):
-            return 'software_engineer'
-        else:
-            return 'general'
+        return self.classify_job_type(keywords)[0][0]
+    
+    def classify_job_type(self, keywords):
+        """Rank job types with confidences for the extracted keywords"""
+        if self.job_model is not None:
+            return self.job_model.classify(keywords)
+        return get_default_job_index().classify(keywords)
+    
+    def detect_job_types(self, keyword_matrix):
+        """Detect job types for every row of a keyword matrix in one vectorized pass"""
+        if self.job_model is not None:
+            return self.job_model.detect_matrix(keyword_matrix)
+        return get_default_job_index().classify_matrix(keyword_matrix)[0]
     
     def create_optimized_skills(self, job_type, keywords):
         """Create job-optimized skills section with compact headings"""
@@ -154,28 +342,9 @@ class ResumeOptimizer:
     def optimize_content(self, content, job_type, keywords):
         """Optimize content with job-specific keywords and enforce 2-line limit"""
         
-        optimized = content
-        
-        # Common optimizations
-        replacements = {
-            r'\bsql\b': 'Advanced SQL' if job_type == 'data_analyst' else 'SQL',
-            r'\banalytics platform\b': 'data engineering platform' if job_type == 'data_engineering' else 'analytics platform',
-            r'\bpython scripts\b': 'data pipelines' if job_type == 'data_engineering' else 'Python automation',
-            r'\bdashboards\b': 'business intelligence dashboards',
-            r'\baws\b': 'AWS cloud services',
-            r'\bagile\b': 'Agile methodology',
-            r'\bweb applications?\b': 'frontend applications',
-            r'\bapi development\b': 'RESTful API development',
-            r'\bscalable\b': 'highly scalable',
-            r'\breliable\b': 'highly reliable',
-            r'\bresilient\b': 'highly resilient',
-            r'\bcross functional\b': 'cross-functional',
-            r'\bproduct challenges\b': 'technical and product challenges',
-            r'\bcommunication skills\b': 'written and verbal communication skills'
-        }
-        
-        for pattern, replacement in replacements.items():
-            optimized = re.sub(pattern, replacement, optimized, flags=re.IGNORECASE)
+        # All keyword rewrites for this job type in a single pass over the
+        # prose text runs, leaving macro names, comments and URLs untouched
+        optimized = rewrite_text(content, get_rewrite_engine(job_type).rewrite)
         
         # Enforce 2-line limit for bullet points
         optimized = self.enforce_bullet_point_limit(optimized)
@@ -184,71 +353,47 @@ class ResumeOptimizer:
     
     def enforce_bullet_point_limit(self, content):
         """Enforce max 2 lines per bullet point"""
-        lines = content.split('\n')
-        optimized_lines = []
-        
-        for line in lines:
-            if '\\resumeItem{' in line:
-                # Extract the content inside \resumeItem{}
-                match = re.search(r'\\resumeItem\{([^}]+)\}', line)
-                if match:
-                    item_content = match.group(1)
-                    # Split by sentences and limit to ~120 characters per line
-                    sentences = re.split(r'[.!?]+', item_content)
-                    if len(item_content) > 120:
-                        # Try to break at natural points
-                        words = item_content.split()
-                        if len(words) > 15:  # More than 15 words
-                            # Find a good breaking point around the middle
-                            mid_point = len(words) // 2
-                            for i in range(mid_point, len(words)):
-                                if words[i].endswith(('.', ',', ';', ':')):
-                                    break_point = i + 1
-                                    break
-                            else:
-                                break_point = mid_point
-                            
-                            line1 = ' '.join(words[:break_point])
-                            line2 = ' '.join(words[break_point:])
-                            new_line = f"\\resumeItem{{{line1} {line2}}}"
-                            optimized_lines.append(new_line)
-                        else:
-                            optimized_lines.append(line)
-                    else:
-                        optimized_lines.append(line)
-                else:
-                    optimized_lines.append(line)
+        document = parse(content)
+        replacements = []
+        
+        for item in document.macros('resumeItem'):
+            if not item.args:
+                continue
+            item_content = document.arg_text(item)
+            # Rendered line count from the Lato glyph widths at \small
+            lines = line_count(item_content)
+            if lines <= MAX_BULLET_LINES:
+                continue
+            
+            preview = ' '.join(item_content.split())[:60]
+            trimmed = trim_to_lines(item_content) if self.trim_long_bullets else None
+            if trimmed is not None:
+                arg = item.args[0]
+                replacements.append((arg.start + 1, arg.end - 1, trimmed))
+                logger.info("✂️  Trimmed %d-line bullet: %s...", lines, preview)
             else:
-                optimized_lines.append(line)
+                logger.warning("⚠️  Bullet wraps to %d lines: %s...", lines, preview)
         
-        return '\n'.join(optimized_lines)
+        return replace_spans(content, replacements) if replacements else content
     
-    def optimize_projects_for_job_type(self, job_type, keywords):
-        """Select and optimize exactly 3 projects based on job type"""
-        
-        # Extract project sections from the original projects.tex
-        project_sections = []
-        current_project = []
-        in_project = False
+    def optimized_section(self, section, job_type):
+        """Parsed model of a section after the job type's content rewrites
         
-        for line in self.sections['projects'].split('\n'):
-            if '\\resumeProjectHeading' in line:
-                if current_project:
-                    project_sections.append('\n'.join(current_project))
-                current_project = [line]
-                in_project = True
-            elif in_project:
-                current_project.append(line)
-                if line.strip() == '\\resumeItemListEnd':
-                    in_project = False
+        Served from the pipeline's memo of the experience/projects stage."""
+        return self.pipeline.call(section, self.sections[section], job_type)
+    
+    def _optimize_section(self, content, job_type, heading):
+        return SectionModel(self.optimize_content(content, job_type, []), heading)
+    
+    def term_weights(self, job_type, keywords):
+        """JD keyword weights plus a weak prior for the job type's focus terms
         
-        if current_project:
-            project_sections.append('\n'.join(current_project))
+        keywords is either a list of terms or a {term: weight} mapping such as
+        the output of extract_weighted_keywords."""
         
-        # Select 3 most relevant projects based on job type
         if job_type == 'software_engineer':
             # Prioritize web development, React, Node.js projects
-            priority_keywords = ['react', 'node', 'web', 'api', 'full-stack', 'javascript', 'typescript']
+            priority_keywords = ['react', 'node.js', 'web', 'api', 'full-stack', 'javascript', 'typescript']
         elif job_type == 'data_engineering':
             # Prioritize data, AWS, Dask, analytics projects
             priority_keywords = ['dask', 'aws', 'data', 'analytics', 'cloud', 'distributed']
@@ -256,151 +401,467 @@ class ResumeOptimizer:
             # Prioritize analytics, visualization, data analysis projects
             priority_keywords = ['analysis', 'analytics', 'data', 'visualization', 'pandas', 'svm']
         else:
-            # General - use all available projects
+            # General - rely on the JD keywords alone
             priority_keywords = []
         
-        # Score projects based on relevance
-        project_scores = []
-        for i, project in enumerate(project_sections):
-            score = 0
-            project_lower = project.lower()
-            for keyword in priority_keywords:
-                if keyword in project_lower:
-                    score += 1
-            project_scores.append((score, i, project))
-        
-        # Sort by score (highest first) and take top 3
-        project_scores.sort(reverse=True)
-        selected_projects = project_scores[:3]
-        
-        # If we don't have 3 projects, use all available
-        if len(selected_projects) < 3:
-            selected_projects = [(0, i, project) for i, project in enumerate(project_sections[:3])]
+        if isinstance(keywords, dict):
+            term_weights = dict(keywords)
+        else:
+            term_weights = {keyword: 1.0 for keyword in keywords}
+        for keyword in priority_keywords:
+            term_weights[keyword] = term_weights.get(keyword, 0.0) + 0.25
+        return term_weights
+    
+    def rank_projects(self, job_type, term_weights, project_count=None):
+        """Project ids ranked by keyword score, unmatched ones after in file order"""
+        projects = self.optimized_section('projects', job_type)
+        total = len(projects.entries)
+        count = total if project_count is None else min(project_count, total)
+        
+        # Top-k by score with a heap, touching only the matched postings
+        ranked = projects.index.top_entries(term_weights, count)
+        if len(ranked) < count:
+            chosen = set(ranked)
+            ranked += [i for i in range(total) if i not in chosen][:count - len(ranked)]
+        return ranked
+    
+    def select_bullets(self, job_type, keywords, line_budget=None, page_blocks=None,
+                       page_height_pt=TEXT_HEIGHT_PT):
+        """Choose the experience and project bullets that fit on the page
+        
+        By default bullets are packed into the page height the other blocks
+        leave free, as predicted by page_estimator; page_blocks are those
+        blocks (heading, education, skills) when already built. With a
+        line_budget, bullets are packed into that many rendered lines instead.
+        
+        Returns (experience_selection, project_selection), each a mapping of
+        entry id to kept bullet ids. Every experience entry keeps at least one
+        bullet; projects are included only when worth their heading."""
+        if line_budget is None:
+            line_budget = self.line_budget
+        
+        experience = self.optimized_section('experience', job_type)
+        projects = self.optimized_section('projects', job_type)
+        term_weights = self.term_weights(job_type, keywords)
+        candidates = self.rank_projects(job_type, term_weights, self.project_count)
+        
+        if line_budget is None:
+            # Costs in fractions of a point, from the memoized block heights
+            if page_blocks is None:
+                page_blocks = [self.sections['heading'], self.sections['education'],
+                               self.create_optimized_skills(job_type, keywords)]
+            fixed_blocks = list(page_blocks) + [experience.prefix, experience.suffix]
+            # Reserved up front, but only counted when a project is kept
+            project_blocks = [PROJECTS_SECTION_START, PROJECTS_SECTION_END]
+            budget = math.floor((page_height_pt - page_height(fixed_blocks + project_blocks))
+                                * HEIGHT_UNITS_PER_PT)
+            
+            def entry_costs(entry, heading_lines):
+                return (height_units(block_height(entry.render([]), 1)),
+                        [height_units(block_height(bullet.source, 2)) for bullet in entry.bullets])
+        else:
+            budget = line_budget
+            
+            def entry_costs(entry, heading_lines):
+                return heading_lines, [bullet.lines for bullet in entry.bullets]
+        
+        groups = []
+        owners = []
+        experience_selection = {}
+        for section, entry_ids, heading_lines, required in (
+                (experience, range(len(experience.entries)), EXPERIENCE_HEADING_LINES, True),
+                (projects, candidates, PROJECT_HEADING_LINES, False)):
+            bullet_scores = section.index.score_bullets(term_weights)
+            for entry_id in entry_ids:
+                entry = section.entries[entry_id]
+                if not entry.bullets:
+                    if required:
+                        # Entries without bullets are always shown as-is
+                        experience_selection[entry_id] = []
+                        budget -= (heading_lines if line_budget is not None
+                                   else height_units(block_height(entry.source, 1)))
+                    continue
+                heading_cost, bullet_costs = entry_costs(entry, heading_lines)
+                groups.append(PackGroup(
+                    heading_cost,
+                    bullet_costs,
+                    [BASE_BULLET_VALUE + bullet_scores.get((entry_id, bullet_id), 0.0)
+                     for bullet_id in range(len(entry.bullets))],
+                    required))
+                owners.append((section is experience, entry_id))
+        
+        for _ in range(MAX_FIT_ATTEMPTS):
+            selection = pack_bullets(groups, max(budget, 0))
+            if selection is None or line_budget is not None:
+                break
+            # Check the chosen layout as a whole and shrink the budget by any overflow
+            entries = [experience.entries[i].source for i in experience_selection]
+            entries += [(experience if is_experience else projects).entries[entry_id].render(bullet_ids)
+                        for (is_experience, entry_id), bullet_ids in zip(owners, selection) if bullet_ids]
+            kept_project = any(bullet_ids for (is_experience, _), bullet_ids in zip(owners, selection)
+                               if not is_experience)
+            height = layout_height(fixed_blocks + project_blocks if kept_project else fixed_blocks, entries)
+            overflow = height - page_height_pt
+            if overflow <= 0:
+                break
+            budget -= height_units(overflow)
+        
+        if selection is None:
+            limit = "page" if line_budget is None else f"{line_budget}-line budget"
+            logger.warning("⚠️  Experience alone exceeds the %s, keeping its best bullet per entry", limit)
+            # Smallest layout the packer allows, so tighter budgets never render longer
+            for (is_experience, entry_id), group in zip(owners, groups):
+                if is_experience:
+                    experience_selection[entry_id] = [group.values.index(max(group.values))]
+            return experience_selection, {}
+        
+        project_selection = {}
+        for (is_experience, entry_id), bullet_ids in zip(owners, selection):
+            if is_experience:
+                experience_selection[entry_id] = bullet_ids
+            elif bullet_ids:
+                project_selection[entry_id] = bullet_ids
+        return experience_selection, project_selection
+    
+    def optimize_projects_for_job_type(self, job_type, keywords, project_count=None, selection=None):
+        """Select and optimize the most relevant projects for the job description
+        
+        With a selection from select_bullets only the packed projects and
+        bullets are kept; otherwise the top project_count projects are used
+        in full. Returns '' when no project is kept, since LaTeX rejects an
+        empty list."""
+        
+        projects = self.optimized_section('projects', job_type)
+        ranked = self.rank_projects(job_type, self.term_weights(job_type, keywords),
+                                    project_count if project_count is not None else self.project_count)
+        if selection is None:
+            selection = {i: range(len(projects.entries[i].bullets)) for i in ranked}
+        if not any(project_id in selection for project_id in ranked):
+            return ''
         
         # Build optimized projects section
-        optimized_projects = """%-----------PROJECTS-----------%
-\\section{Projects}
-\\resumeSubHeadingListStart"""
+        optimized_projects = PROJECTS_SECTION_START
         
-        for score, idx, project in selected_projects:
-            optimized_project = self.optimize_content(project, job_type, keywords)
-            optimized_projects += "\n\n" + optimized_project
+        for project_id in ranked:
+            if project_id in selection:
+                optimized_projects += "\n\n" + projects.entries[project_id].render(selection[project_id])
         
-        optimized_projects += "\n\n\\resumeSubHeadingListEnd"
+        optimized_projects += PROJECTS_SECTION_END
         
         return optimized_projects
     
-    def generate_resume(self, job_description, job_title=""):
-        """Generate optimized resume with strict 1-page formatting"""
-        
-        print("\n🔍 Analyzing job description...")
-        keywords = self.extract_keywords(job_description)
-        job_type = self.detect_job_type(keywords)
-        
-        print(f"📊 Found {len(keywords)} keywords")
-        print(f"🎯 Job type: {job_type.replace('_', ' ').title()}")
-        
-        # Generate filename
+    def layout_sections(self, job_type, keyword_weights, optimized_skills, line_budget=None,
+                        page_height_pt=TEXT_HEIGHT_PT):
+        """Select bullets for the budget: (experience LaTeX, projects LaTeX)"""
+        experience_selection, project_selection = self.select_bullets(
+            job_type, keyword_weights, line_budget=line_budget,
+            page_blocks=[self.sections['heading'], self.sections['education'], optimized_skills],
+            page_height_pt=page_height_pt)
+        optimized_experience = self.optimized_section('experience', job_type).render(experience_selection)
+        optimized_projects = self.optimize_projects_for_job_type(job_type, keyword_weights,
+                                                                 selection=project_selection)
+        return optimized_experience, optimized_projects
+    
+    def build_pipeline(self):
+        """Stage graph of one resume; each stage is memoized on its inputs"""
+        return Pipeline([
+            Stage('keywords', self.extract_keywords, ['job_description']),
+            Stage('weights', lambda job_description: dict(self.extract_weighted_keywords(job_description)),
+                  ['job_description']),
+            Stage('job_type', self.detect_job_type, ['keywords']),
+            Stage('template', ResumeTemplate, ['preamble', 'heading_tex', 'education_tex'], memo=4),
+            # skills_tex is what the general job type falls back to
+            Stage('skills', lambda job_type, skills_tex: self.create_optimized_skills(job_type, []),
+                  ['job_type', 'skills_tex']),
+            Stage('experience', lambda content, job_type: self._optimize_section(
+                content, job_type, 'resumeSubheading'), ['experience_tex', 'job_type']),
+            Stage('projects', lambda content, job_type: self._optimize_section(
+                content, job_type, 'resumeProjectHeading'), ['projects_tex', 'job_type']),
+            # Bullet selection reads the optimized sections through optimized_section
+            Stage('layout', lambda job_type, weights, skills, experience, projects, heading, education,
+                  line_budget, page_height_pt: self.layout_sections(job_type, weights, skills,
+                                                                    line_budget, page_height_pt),
+                  ['job_type', 'weights', 'skills', 'experience', 'projects', 'heading_tex',
+                   'education_tex', 'line_budget', 'page_height_pt']),
+            Stage('document', lambda template, timestamp, job_type, keywords, skills, layout:
+                  template.chunks(timestamp, job_type, len(keywords), skills, *layout),
+                  ['template', 'timestamp', 'job_type', 'keywords', 'skills', 'layout'], memo=0),
+        ])
+    
+    def stage_inputs(self, **inputs):
+        """Pipeline sources from the loaded sections, plus the given inputs"""
+        inputs.setdefault('line_budget', self.line_budget)
+        inputs.setdefault('page_height_pt', TEXT_HEIGHT_PT)
+        inputs['preamble'] = self.preamble
+        for section in ('heading', 'education', 'skills', 'experience', 'projects'):
+            inputs[f'{section}_tex'] = self.sections[section]
+        return inputs
+    
+    def render_chunks(self, job_type, keywords, keyword_weights, optimized_skills, timestamp,
+                      line_budget=None, page_height_pt=TEXT_HEIGHT_PT):
+        """Select bullets for the budget and assemble the document as template chunks"""
+        inputs = self.stage_inputs(job_type=job_type, keywords=keywords, weights=keyword_weights,
+                                   skills=optimized_skills, timestamp=timestamp,
+                                   page_height_pt=page_height_pt)
+        if line_budget is not None:
+            inputs['line_budget'] = line_budget
+        return self.pipeline.run(inputs, targets=('document',))['document']
+    
+    def render_resume(self, *args, **kwargs):
+        """The complete LaTeX document as one string; see render_chunks"""
+        return ''.join(self.render_chunks(*args, **kwargs))
+    
+    def fit_compiled(self, compile_pool, job_type, keywords, keyword_weights, optimized_skills,
+                     timestamp, complete_resume):
+        """Compile the resume and tighten the budget until the PDF has one page
+        
+        Returns (latex, pdf bytes), or the untightened latex and None when it
+        cannot be made to fit or does not compile."""
+        if self.line_budget is not None:
+            steps = self.line_budget
+            
+            def render(step):
+                return self.render_resume(job_type, keywords, keyword_weights, optimized_skills,
+                                          timestamp, line_budget=self.line_budget - step)
+        else:
+            # Tighten the page height one \small line at a time
+            steps = int(TEXT_HEIGHT_PT / 2 // COMPILE_STEP_PT)
+            
+            def render(step):
+                if step == 0:
+                    return complete_resume
+                return self.render_resume(job_type, keywords, keyword_weights, optimized_skills,
+                                          timestamp, page_height_pt=TEXT_HEIGHT_PT - step * COMPILE_STEP_PT)
+        
+        logger.info("\n🛠️  Compiling with %s...", compile_pool.engine[0])
+        fitted = fit_one_page(compile_pool, render, steps)
+        if fitted is None:
+            logger.warning("⚠️  Could not compile a one-page PDF, keeping the estimated layout")
+            return complete_resume, None
+        step, latex, result = fitted
+        if step:
+            logger.info("📏 Tightened the budget by %d step(s) to fit one page", step)
+        return latex, result.pdf
+    
+    def timestamp(self):
+        """Generated: time of a resume; fixed by SOURCE_DATE_EPOCH in deterministic mode"""
+        if self.deterministic:
+            epoch = int(os.environ.get('SOURCE_DATE_EPOCH', '0'))
+            return datetime.fromtimestamp(epoch, timezone.utc).strftime("%Y-%m-%d %H:%M")
+        return datetime.now().strftime("%Y-%m-%d %H:%M")
+    
+    def source_digest(self):
+        """Hash of everything besides the job description that shapes the output"""
+        if self._source_digest is None:
+            with open(DEFAULT_TAXONOMY, 'rb') as f:
+                taxonomy = f.read()
+            parts = [str(OPTIMIZER_VERSION), self.preamble, taxonomy,
+                     str(get_default_idf_index().n_documents),
+                     repr((self.project_count, self.line_budget, self.trim_long_bullets))]
+            parts += [self.sections[section] for section in sorted(self.sections)]
+            if self.job_model is not None:
+                parts += [repr(self.job_model.labels), self.job_model.class_log_prior.tobytes(),
+                          self.job_model.feature_log_prob.tobytes()]
+            self._source_digest = cache_key(*parts)
+        return self._source_digest
+    
+    def output_key(self, job_description, compiled=False):
+        """Output cache key of a job description"""
+        return cache_key(self.source_digest(), self.timestamp(), 'pdf' if compiled else 'tex',
+                         normalize_job_description(job_description))
+    
+    def resume_filename(self, job_title, job_type, output_dir=None):
         if job_title:
             clean_title = re.sub(r'[^a-zA-Z0-9\s]', '', job_title)
             filename = f"{clean_title.replace(' ', '_')}_Resume.tex"
         else:
             filename = f"{job_type.title().replace('_', '_')}_Resume.tex"
+        if output_dir:
+            filename = os.path.join(output_dir, filename)
+        return filename
+    
+    def build_resume(self, job_description, job_title="", compile_pool=None, output_dir=None,
+                     save=False):
+        """Generate a resume in memory and return it as a ResumeResult
+        
+        Nothing is written unless save is set; result.filename is derived
+        from job_title and output_dir (default: the current directory).
+        With a latex_compiler.CompilePool the resume is also compiled and
+        its budget tightened until the PDF has one page. timings has the
+        seconds spent in each pipeline stage that was not memoized."""
+        timings = {}
+        stage_start = time.perf_counter()
+        
+        key = None
+        if self.output_cache is not None:
+            key = self.output_key(job_description, compile_pool is not None)
+            entry = self.output_cache.get(key)
+            stage_start = self._record_stage(timings, 'cache_get', stage_start)
+            if entry is not None:
+                latex, keywords, job_type, pdf = entry
+                logger.info("\n♻️  Reusing the cached resume for this job description")
+                result = ResumeResult([latex], keywords, job_type,
+                                      self.resume_filename(job_title, job_type, output_dir),
+                                      timings, pdf, cached=True)
+                return self._finish(result, save, stage_start)
+        
+        logger.info("\n🔍 Analyzing job description...")
+        run = self.pipeline.run(self.stage_inputs(job_description=job_description,
+                                                  timestamp=self.timestamp()),
+                                targets=('document',), executor=self.stage_executor)
+        timings.update(run.timings)
+        stage_start = time.perf_counter()
+        keywords, job_type, chunks = run['keywords'], run['job_type'], run['document']
+        
+        logger.info("📊 Found %d keywords", len(keywords))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("🎯 Job type: %s", job_type.replace('_', ' ').title())
+        
+        pdf = None
+        if compile_pool is not None:
+            complete_resume, pdf = self.fit_compiled(compile_pool, job_type, keywords, run['weights'],
+                                                     run['skills'], run['timestamp'], ''.join(chunks))
+            chunks = [complete_resume]
+            stage_start = self._record_stage(timings, 'compile', stage_start)
+        
+        result = ResumeResult(chunks, keywords, job_type,
+                              self.resume_filename(job_title, job_type, output_dir), timings, pdf)
+        if key is not None:
+            self.output_cache.put(key, (result.latex, keywords, job_type, pdf))
+            stage_start = self._record_stage(timings, 'cache_put', stage_start)
+        return self._finish(result, save, stage_start)
+    
+    def _finish(self, result, save, stage_start):
+        if save:
+            # Save file
+            result.save()
+            logger.info("\n✅ Generated: %s", result.filename)
+            if result.pdf is not None:
+                logger.info("📄 Compiled: %s", result.pdf_filename())
+            else:
+                logger.info("📄 Ready for Overleaf!")
+            logger.info("🎯 Expected ATS score: 85-95%")
+            self._record_stage(result.timings, 'write', stage_start)
+        return result
+    
+    def generate_resume(self, job_description, job_title="", compile_pool=None, output_dir=None):
+        """Generate optimized resume with strict 1-page formatting
         
-        # Create optimized sections
-        optimized_skills = self.create_optimized_skills(job_type, keywords)
-        optimized_experience = self.optimize_content(self.sections['experience'], job_type, keywords)
-        optimized_projects = self.optimize_projects_for_job_type(job_type, keywords)
-        
-        # Build complete resume
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-        
-        # Create the resume header
-        resume_header = f"""%-------------------------
-% ATS Optimized Resume
-% Generated: {timestamp}
-% Job Type: {job_type.replace('_', ' ').title()}
-% Keywords: {len(keywords)} strategic terms
-%------------------------
-
-\\documentclass[letterpaper,11pt]{{article}}
-
-\\usepackage{{fontawesome5}}
-\\usepackage{{latexsym}}
-\\usepackage[empty]{{fullpage}}
-\\usepackage{{titlesec}}
-\\usepackage{{marvosym}}
-\\usepackage[usenames,dvipsnames]{{color}}
-\\usepackage{{verbatim}}
-\\usepackage{{enumitem}}
-\\usepackage[hidelinks]{{hyperref}}
-\\usepackage{{fancyhdr}}
-\\usepackage[english]{{babel}}
-\\usepackage{{tabularx}}
-\\input{{glyphtounicode}}
-
-% Font and formatting
-\\usepackage[default]{{lato}}
-\\pagestyle{{fancy}}
-\\fancyhf{{}}
-\\renewcommand{{\\headrulewidth}}{{0pt}}
-\\renewcommand{{\\footrulewidth}}{{0pt}}
-
-% Margins
-\\addtolength{{\\oddsidemargin}}{{-0.5in}}
-\\addtolength{{\\evensidemargin}}{{-0.5in}}
-\\addtolength{{\\textwidth}}{{1in}}
-\\addtolength{{\\topmargin}}{{-0.7in}}
-\\addtolength{{\\textheight}}{{1.5in}}
+        Writes the .tex (and the PDF, when compiling) and returns its filename;
+        use build_resume for the in-memory result."""
+        return self.build_resume(job_description, job_title, compile_pool, output_dir, save=True).filename
+    
+    def _record_stage(self, timings, stage, start):
+        """Store the seconds since start under stage and return the new start"""
+        now = time.perf_counter()
+        timings[stage] = now - start
+        return now
 
-\\urlstyle{{same}}
-\\raggedbottom
-\\raggedright
-\\setlength{{\\tabcolsep}}{{0in}}
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Generate ATS optimized resumes from job descriptions")
+    parser.add_argument('--ingest-idf', nargs='+', metavar='PATH',
+                        help="add .txt job descriptions (files or folders) to the keyword IDF index")
+    parser.add_argument('--train-job-model', metavar='DIR',
+                        help="train a job type model from DIR/<job_type>/*.txt and save it to --job-model")
+    parser.add_argument('--batch', metavar='PATH',
+                        help="generate a resume per job description in a folder of .txt files "
+                             "or a JSONL file of {title, description} records")
+    parser.add_argument('--output-dir', default='.', metavar='DIR',
+                        help="where --batch writes the resumes (default: current directory)")
+    parser.add_argument('--workers', type=int, default=DEFAULT_BATCH_WORKERS, metavar='N',
+                        help="worker processes for --batch and --serve (default: %(default)s)")
+    parser.add_argument('--projects', type=int, metavar='N',
+                        help="only consider the N best-matching projects (default: all)")
+    parser.add_argument('--line-budget', type=int, metavar='LINES',
+                        help="pack experience and projects into LINES rendered lines "
+                             "(default: fit the estimated one-page height)")
+    parser.add_argument('--trim-long-bullets', action='store_true',
+                        help="cut bullets longer than two rendered lines at a clause boundary")
+    parser.add_argument('--compile', action='store_true',
+                        help="compile the resume locally and tighten the budget until the PDF has one page")
+    parser.add_argument('--compile-workers', type=int, default=DEFAULT_COMPILE_WORKERS, metavar='N',
+                        help="LaTeX processes to run at once when compiling (default: %(default)s)")
+    parser.add_argument('--job-model', metavar='PATH', nargs='?', const=DEFAULT_MODEL_DIR,
+                        help="detect job types with a trained model (default location: %(const)s)")
+    parser.add_argument('--deterministic', action='store_true',
+                        help="identical inputs give identical bytes (Generated: from SOURCE_DATE_EPOCH)")
+    parser.add_argument('--cache', metavar='DIR', nargs='?', const=DEFAULT_OUTPUT_CACHE_DIR,
+                        help="reuse resumes for job descriptions seen before, implies --deterministic "
+                             "(default location: %(const)s)")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_OUTPUT_CACHE_MB, metavar='MB',
+                        help="evict least recently used cached resumes past this size (default: %(default)s)")
+    parser.add_argument('--stage-workers', type=int, default=1, metavar='N',
+                        help="threads for independent pipeline stages (default: %(default)s)")
+    parser.add_argument('--serve', type=int, metavar='PORT', nargs='?', const=DEFAULT_PORT,
+                        help="serve POST /resume over HTTP with warm workers (default port: %(const)s)")
+    parser.add_argument('--host', default=DEFAULT_HOST,
+                        help="address for --serve to listen on (default: %(default)s)")
+    parser.add_argument('--watch', action='store_true',
+                        help="keep running and regenerate whenever src/ or quick_optimizer.py is saved")
+    parser.add_argument('--warm-start', action='store_true',
+                        help="precompute the sections of every job type when src/ loads")
+    return parser.parse_args(argv)
 
-% Section formatting
-\\titleformat{{\\section}}{{\\vspace{{-13pt}}\\scshape\\raggedright\\large}}{{}}{{0em}}{{}}[\\color{{black}}\\titlerule\\vspace{{-5pt}}]
-\\pdfgentounicode=1
+def configure_logging(level=logging.INFO):
+    """Show the optimizer's progress messages on stdout, as the CLI does
 
-% Commands
-\\newcommand{{\\resumeItem}}[1]{{\\item\\small{{{{#1 \\vspace{{-2pt}}}}}}}}
-\\newcommand{{\\resumeSubheading}}[4]{{\\vspace{{-2pt}}\\item\\textbf{{#1}}, \\textit{{\\small #3}}, \\hfill \\textit{{\\small #4}} \\vspace{{-7pt}}}}
-\\newcommand{{\\resumeProjectHeading}}[2]{{\\item\\begin{{tabular*}}{{0.97\\textwidth}}{{l@{{\\extracolsep{{\\fill}}}}r}}\\small#1 & #2 \\\\\\end{{tabular*}}\\vspace{{-7pt}}}}
-\\newcommand{{\\resumeSubItem}}[1]{{\\resumeItem{{#1}}\\vspace{{-4pt}}}}
-\\renewcommand\\labelitemii{{$\\vcenter{{\\hbox{{\\tiny$\\bullet$}}}}$}}
-\\newcommand{{\\resumeSubHeadingListStart}}{{\\begin{{itemize}}[leftmargin=0.15in, label={{}}]}}
-\\newcommand{{\\resumeSubHeadingListEnd}}{{\\end{{itemize}}}}
-\\newcommand{{\\resumeItemListStart}}{{\\begin{{itemize}}}}
-\\newcommand{{\\resumeItemListEnd}}{{\\end{{itemize}}\\vspace{{-5pt}}}}
+    Calling it again only updates the level and stream."""
+    global _cli_handler
+    if _cli_handler is None:
+        _cli_handler = logging.StreamHandler(sys.stdout)
+        _cli_handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(_cli_handler)
+    else:
+        _cli_handler.setStream(sys.stdout)
+    logger.setLevel(level)
+    logger.propagate = False
 
-\\begin{{document}}"""
-        
-        # Combine all parts
-        complete_resume = (resume_header + "\n\n" +
-                          self.sections['heading'] + "\n\n" +
-                          self.sections['education'] + "\n\n" +
-                          optimized_skills + "\n\n" +
-                          optimized_experience + "\n\n" +
-                          optimized_projects + "\n\n" +
-                          "\\end{document}")
-        
-        # Save file
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(complete_resume)
-        
-        print(f"\n✅ Generated: {filename}")
-        print(f"📄 Ready for Overleaf!")
-        print(f"🎯 Expected ATS score: 85-95%")
-        
-        return filename
-
-def main():
+def main(argv=None):
+    args = parse_args(argv)
+    configure_logging()
     print("🎯 ATS Resume Optimizer")
     print("=" * 50)
     
+    if args.ingest_idf:
+        index = ingest_corpus(args.ingest_idf)
+        print(f"📚 IDF index now covers {index.n_documents} job descriptions")
+        return
+    
+    if args.train_job_model:
+        model_dir = args.job_model or DEFAULT_MODEL_DIR
+        model, count = train_job_model(args.train_job_model, model_dir)
+        print(f"🧠 Trained job model on {count} job descriptions ({len(model.labels)} job types)")
+        print(f"💾 Saved to {model_dir}")
+        return
+    
+    optimizer_options = {
+        'job_model': args.job_model,
+        'project_count': args.projects,
+        'line_budget': args.line_budget,
+        'trim_long_bullets': args.trim_long_bullets,
+        'deterministic': args.deterministic,
+        'output_cache': OutputCache(args.cache, args.cache_size << 20) if args.cache else None,
+        'stage_workers': args.stage_workers,
+        'warm_start': args.warm_start,
+    }
+    
+    if args.batch:
+        print(f"📦 Generating resumes for {args.batch} with {args.workers} workers\n")
+        failures = run_batch(args.batch, args.output_dir, args.workers, optimizer_options)
+        return 1 if failures else None
+    
+    if args.serve is not None:
+        run_server(args.host, args.serve, args.workers, optimizer_options)
+        return
+    
     # Try to read job description from quick_optimizer.py first
     job_description, job_title = read_job_from_quick_optimizer()
     
+    if args.watch and not job_description:
+        print("❌ --watch reads the job description from quick_optimizer.py")
+        return 1
+    
     if not job_description:
         # Fallback to interactive mode
         print("\n📋 Instructions:")
@@ -439,13 +900,30 @@ def main():
         job_title = input("\nJob title (optional): ").strip()
     
     # Initialize optimizer
-    optimizer = ResumeOptimizer()
+    optimizer = ResumeOptimizer(**optimizer_options)
     if not optimizer.sections:
         return
     
+    compile_pool = None
+    if args.compile:
+        try:
+            compile_pool = CompilePool(args.compile_workers, preamble=optimizer.preamble)
+            if compile_pool.format_dir is not None:
+                print(f"⚡ Loading the preamble from its precompiled format in {compile_pool.format_dir}")
+        except FileNotFoundError as e:
+            print(f"❌ {e}, skipping compilation")
+    
+    if args.watch:
+        try:
+            return watch(optimizer, 'quick_optimizer.py', read_job_from_quick_optimizer,
+                         compile_pool=compile_pool)
+        finally:
+            if compile_pool is not None:
+                compile_pool.close()
+    
     # Generate resume
     try:
-        filename = optimizer.generate_resume(job_description, job_title)
+        filename = optimizer.generate_resume(job_description, job_title, compile_pool=compile_pool)
         print(f"\n🎉 SUCCESS!")
         print(f"\n📋 Next steps:")
         print(f"1. Go to Overleaf.com")
@@ -455,6 +933,9 @@ def main():
         
     except Exception as e:
         print(f"❌ Error: {e}")
+    finally:
+        if compile_pool is not None:
+            compile_pool.close()
 
 def read_job_from_quick_optimizer():
     """Read job description and title from quick_optimizer.py"""
@@ -490,4 +971,4 @@ def read_job_from_quick_optimizer():
         return None, None
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Resume Server for Resume Optimizer
+A local HTTP service that keeps warm optimizers in a process pool and
+answers POST /resume with the generated LaTeX
+"""
+
+import os
+import json
+from http import HTTPStatus
+
+from batch_runner import init_worker, build_in_worker, DEFAULT_BATCH_WORKERS
+from lazy_imports import lazy_import
+from output_cache import cache_key, normalize_job_description
+
+asyncio = lazy_import('asyncio')
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+MAX_HEADER_BYTES = 64 << 10
+MAX_BODY_BYTES = 1 << 20
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ResumeServer:
+    """Serves resumes over HTTP from a pool of warm optimizer processes
+
+    POST /resume takes {"description": ..., "title": ...} and returns the
+    resume as JSON, or the bare LaTeX when the client accepts
+    application/x-tex. GET /health reports request counts. Requests for a
+    job description (and title) already being generated wait for that
+    computation instead of starting another."""
+
+    def __init__(self, workers=DEFAULT_BATCH_WORKERS, optimizer_options=None):
+        from concurrent.futures import ProcessPoolExecutor
+
+        options = dict(optimizer_options or {})
+        options.setdefault('warm_start', True)
+        self.workers = max(1, workers)
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker,
+                                            initargs=(options,))
+        self.in_flight = {}
+        self.stats = {'requests': 0, 'computed': 0, 'coalesced': 0}
+
+    async def start(self):
+        """Start the worker processes, so the first request finds them warm"""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(self.executor, os.getpid)
+                               for _ in range(self.workers)])
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+    async def listen(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Start the workers and accept connections; returns the asyncio server"""
+        await self.start()
+        return await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES)
+
+    async def generate(self, description, title=''):
+        """The ResumeResult for a job description, shared with identical requests in flight"""
+        key = cache_key(normalize_job_description(description), title)
+        future = self.in_flight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.executor, build_in_worker, title, description, None)
+            self.in_flight[key] = future
+            future.add_done_callback(lambda _: self.in_flight.pop(key, None))
+            self.stats['computed'] += 1
+        else:
+            self.stats['coalesced'] += 1
+        # A client hanging up must not cancel the computation for the others
+        return await asyncio.shield(future)
+
+    async def route(self, method, path, headers, body):
+        """(status, content type, body bytes) for one request"""
+        if path == '/health':
+            if method != 'GET':
+                raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, "Use GET")
+            return self.json_response(HTTPStatus.OK, dict(self.stats, status='ok', workers=self.workers))
+        if path != '/resume':
+            raise HttpError(HTTPStatus.NOT_FOUND, f"No such endpoint: {path}")
+        if method != 'POST':
+            raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, "Use POST")
+
+        try:
+            request = json.loads(body)
+            description = request.get('description')
+            title = request.get('title') or ''
+        except (ValueError, AttributeError):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object")
+        if not isinstance(description, str) or not description.strip():
+            raise HttpError(HTTPStatus.BAD_REQUEST, "description is required")
+        if not isinstance(title, str):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "title must be a string")
+
+        self.stats['requests'] += 1
+        result = await self.generate(description, title)
+        if 'application/x-tex' in headers.get('accept', ''):
+            return HTTPStatus.OK, 'application/x-tex; charset=utf-8', result.latex.encode('utf-8')
+        return self.json_response(HTTPStatus.OK, {
+            'filename': os.path.basename(result.filename),
+            'job_type': result.job_type,
+            'keywords': result.keywords,
+            'timings': result.timings,
+            'latex': result.latex,
+        })
+
+    @staticmethod
+    def json_response(status, payload):
+        return status, 'application/json', json.dumps(payload).encode('utf-8')
+
+    async def handle(self, reader, writer):
+        """Serve the requests of one connection (HTTP/1.1 keep-alive)"""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    await self.respond(writer, *self.json_response(
+                        HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, {'error': "Headers too large"}), False)
+                    break
+
+                lines = head.decode('latin-1').split('\r\n')
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(':')
+                    if value:
+                        headers[name.strip().lower()] = value.strip()
+                try:
+                    method, target, version = lines[0].split(' ', 2)
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    await self.respond(writer, *self.json_response(
+                        HTTPStatus.BAD_REQUEST, {'error': "Malformed request"}), False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self.respond(writer, *self.json_response(
+                        HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {'error': "Body too large"}), False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                try:
+                    response = await self.route(method, target.split('?', 1)[0], headers, body)
+                except HttpError as e:
+                    response = self.json_response(e.status, {'error': str(e)})
+                except Exception as e:
+                    response = self.json_response(HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(e)})
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                await self.respond(writer, *response, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def respond(writer, status, content_type, body, keep_alive):
+        writer.write((f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                      f"Content-Type: {content_type}\r\n"
+                      f"Content-Length: {len(body)}\r\n"
+                      f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode('latin-1'))
+        writer.write(body)
+        await writer.drain()
+
+
+def run_server(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=DEFAULT_BATCH_WORKERS, optimizer_options=None):
+    """Serve until interrupted"""
+    server = ResumeServer(workers, optimizer_options)
+
+    async def serve():
+        listener = await server.listen(host, port)
+        print(f"🌐 Serving resumes on http://{host}:{port}/resume with {server.workers} workers (Ctrl+C to stop)")
+        async with listener:
+            await listener.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print("\n👋 Server stopped")
+    finally:
+        server.close()
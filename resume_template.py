@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Resume Template for Resume Optimizer
+Joins the static parts of the document (comment banner, preamble, heading,
+education) once, so each resume is a short list of chunks to join or write
+"""
+
+HEADER_START = "%-------------------------\n% ATS Optimized Resume\n% Generated: "
+SECTION_SEPARATOR = "\n\n"
+DOCUMENT_END = "\n\n\\end{document}"
+
+
+class ResumeTemplate:
+    """Prebuilt chunks of the document around the per-job sections"""
+    __slots__ = ('static_body',)
+
+    def __init__(self, preamble, heading, education):
+        # Everything from the end of the comment banner to the skills section
+        self.static_body = ''.join([
+            "%------------------------\n\n", preamble, "\n\\begin{document}",
+            SECTION_SEPARATOR, heading, SECTION_SEPARATOR, education, SECTION_SEPARATOR,
+        ])
+
+    def chunks(self, timestamp, job_type, keyword_count, skills, experience, projects):
+        """The document as a list of strings, in order; an empty projects section is left out"""
+        return [
+            HEADER_START, timestamp,
+            "\n% Job Type: ", job_type.replace('_', ' ').title(),
+            "\n% Keywords: ", str(keyword_count), " strategic terms\n",
+            self.static_body,
+            skills, SECTION_SEPARATOR, experience, SECTION_SEPARATOR if projects else '', projects,
+            DOCUMENT_END,
+        ]
+
+    def render(self, *args):
+        """The document as one string; takes the same arguments as chunks"""
+        return ''.join(self.chunks(*args))
+
+
+def write_chunks(path, chunks):
+    """Stream chunks to a file without joining them first"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(chunks)
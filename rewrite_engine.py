@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Rewrite Engine for Resume Optimizer
+Compiles every content rewrite rule for a job type into one alternation
+regex so each section is rewritten in a single pass
+"""
+
+import re
+
+
+def rewrite_rules(job_type):
+    """Return the ordered (pattern, replacement) rules for a job type"""
+    return [
+        (r'\bsql\b', 'Advanced SQL' if job_type == 'data_analyst' else 'SQL'),
+        (r'\banalytics platform\b', 'data engineering platform' if job_type == 'data_engineering' else 'analytics platform'),
+        (r'\bpython scripts\b', 'data pipelines' if job_type == 'data_engineering' else 'Python automation'),
+        (r'\bdashboards\b', 'business intelligence dashboards'),
+        (r'\baws\b', 'AWS cloud services'),
+        (r'\bagile\b', 'Agile methodology'),
+        (r'\bweb applications?\b', 'frontend applications'),
+        (r'\bapi development\b', 'RESTful API development'),
+        (r'\bscalable\b', 'highly scalable'),
+        (r'\breliable\b', 'highly reliable'),
+        (r'\bresilient\b', 'highly resilient'),
+        (r'\bcross functional\b', 'cross-functional'),
+        (r'\bproduct challenges\b', 'technical and product challenges'),
+        (r'\bcommunication skills\b', 'written and verbal communication skills')
+    ]
+
+
+def rewrite_sequential(text, rules):
+    """Reference implementation: one re.sub pass per rule, in order"""
+    for pattern, replacement in rules:
+        text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+    return text
+
+
+def _pattern_words(pattern):
+    """Literal words of a regex pattern, ignoring escapes such as \\b"""
+    return re.findall(r'[a-z0-9]+', re.sub(r'\\[a-zA-Z]', ' ', pattern.lower()))
+
+
+def _may_overlap(first, second):
+    """Whether two rule patterns could match overlapping text
+
+    Overlapping matches share text, so patterns whose words are not parts
+    of one another cannot overlap (words are compared as substrings to
+    allow for optional suffixes like applications? and missing \\b)."""
+    return any(a in b or b in a for a in _pattern_words(first) for b in _pattern_words(second))
+
+
+class RewriteEngine:
+    """Single-pass rewriter equivalent to rewrite_sequential for its rules
+
+    The fused regex gives the same output as one pass per rule as long as no
+    two rule patterns can match overlapping text and no replacement contains
+    text matched by a later rule. Rule sets that may break this (patterns
+    sharing a word or part of one), or that use capturing groups or escapes
+    in replacements, are rewritten sequentially instead."""
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.replacements = [replacement for _, replacement in self.rules]
+        self.pattern = None
+        if self._can_fuse():
+            self.pattern = re.compile(self._fused_pattern(), re.IGNORECASE)
+
+    def _fused_pattern(self):
+        """Build the alternation, hoisting shared word boundaries out of it
+
+        A plain alternation makes the regex engine try every rule at every
+        position. When all rules are \\b-delimited words, one leading \\b
+        plus a lookahead on the possible first letters lets it skip almost
+        every position after a single check."""
+        patterns = [pattern for pattern, _ in self.rules]
+        if not all(p.startswith(r'\b') and p.endswith(r'\b') and len(p) > 4 for p in patterns):
+            return '|'.join(f'({pattern})' for pattern in patterns)
+
+        bodies = [p[2:-2] for p in patterns]
+        alternation = '(?:' + '|'.join(f'({body})' for body in bodies) + r')\b'
+        first_chars = {body[0] for body in bodies}
+        if all(ch.isalnum() for ch in first_chars):
+            return r'\b(?=[' + ''.join(sorted(first_chars)) + '])' + alternation
+        return r'\b' + alternation
+
+    def _can_fuse(self):
+        compiled = [re.compile(pattern, re.IGNORECASE) for pattern, _ in self.rules]
+        if any(regex.groups for regex in compiled):
+            # Capturing groups would shift match.lastindex
+            return False
+        if any('\\' in replacement for replacement in self.replacements):
+            # re.sub expands escapes in replacements, the lookup does not
+            return False
+        for i, replacement in enumerate(self.replacements):
+            if any(later.search(replacement) for later in compiled[i + 1:]):
+                return False
+        patterns = [pattern for pattern, _ in self.rules]
+        for i, pattern in enumerate(patterns):
+            if any(_may_overlap(pattern, later) for later in patterns[i + 1:]):
+                # One pass lets the earlier rule consume text that the fused
+                # regex would give to a later rule matching from further left
+                return False
+        return True
+
+    def _lookup(self, match):
+        return self.replacements[match.lastindex - 1]
+
+    def rewrite(self, text):
+        """Apply every rule to text"""
+        if self.pattern is None:
+            return rewrite_sequential(text, self.rules)
+        return self.pattern.sub(self._lookup, text)
+
+
+_engines = {}
+
+
+def get_rewrite_engine(job_type):
+    """Return the compiled engine for a job type, building it on first use"""
+    engine = _engines.get(job_type)
+    if engine is None:
+        engine = _engines[job_type] = RewriteEngine(rewrite_rules(job_type))
+    return engine
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Streamlit UI for Resume Optimizer
+Run with: streamlit run streamlit_app.py
+
+The optimizer and keyword matcher load once per server process. Keyword
+and job type analysis re-runs as the description is typed and is memoized
+per description; the document itself is only assembled, from the
+optimizer's warm stage memo, when the download is clicked
+"""
+
+import threading
+
+import streamlit as st
+
+from keyword_engine import get_default_matcher
+from resume_optimizer import ResumeOptimizer
+from resume_template import SECTION_SEPARATOR
+
+# Pause in typing after which the description is sent for analysis
+LIVE_DEBOUNCE_MS = 300
+
+_LIVE_TEXT_AREA_HTML = '<label class="label"></label><textarea></textarea>'
+_LIVE_TEXT_AREA_CSS = """
+.label { display: block; font-size: 14px; margin-bottom: 4px; color: var(--st-text-color); }
+textarea {
+  width: 100%; box-sizing: border-box; padding: 10px 14px; resize: vertical;
+  font-family: var(--st-font); font-size: 15px; color: var(--st-text-color);
+  background: var(--st-secondary-background-color);
+  border: 1px solid rgba(127, 127, 127, 0.3); border-radius: 6px; outline: none;
+}
+textarea:focus { border-color: var(--st-primary-color); }
+"""
+_LIVE_TEXT_AREA_JS = """
+export default function({ parentElement, data, setStateValue }) {
+  const area = parentElement.querySelector('textarea');
+  parentElement.querySelector('.label').textContent = data.label;
+  area.placeholder = data.placeholder;
+  if (!parentElement._attached) {
+    area.style.height = `${data.height}px`;
+    let timer = null;
+    area.addEventListener('input', () => {
+      clearTimeout(timer);
+      timer = setTimeout(() => setStateValue('value', area.value), data.debounce);
+    });
+    parentElement._attached = true;
+  }
+}
+"""
+
+try:
+    from streamlit.components.v2 import component
+except ImportError:
+    # Streamlit without custom components v2: st.text_area only reports its
+    # value when it loses focus or on Ctrl+Enter
+    _live_text_area = None
+else:
+    _live_text_area = component('live_text_area', html=_LIVE_TEXT_AREA_HTML,
+                                css=_LIVE_TEXT_AREA_CSS, js=_LIVE_TEXT_AREA_JS)
+
+
+def job_description_input(label, placeholder, height=300):
+    """A text area whose value reaches the app while typing, LIVE_DEBOUNCE_MS after the last keystroke"""
+    if _live_text_area is None:
+        return st.text_area(label, height=height, placeholder=placeholder)
+    result = _live_text_area(data={'label': label, 'placeholder': placeholder, 'height': height,
+                                   'debounce': LIVE_DEBOUNCE_MS},
+                             default={'value': ''}, key='job_description',
+                             on_value_change=lambda: None)
+    return result.value or ''
+
+
+@st.cache_resource
+def load_optimizer():
+    """One warm optimizer per server process, shared by every session"""
+    return ResumeOptimizer(warm_start=True)
+
+
+@st.cache_resource
+def optimizer_lock():
+    """Sessions run on separate threads and the optimizer's memo is not thread-safe"""
+    return threading.Lock()
+
+
+@st.cache_resource
+def load_matcher():
+    return get_default_matcher()
+
+
+@st.cache_data(max_entries=256)
+def analyze(job_description):
+    """(keywords, [(job_type, confidence), ...], [(keyword, weight), ...]) of a job description"""
+    optimizer = load_optimizer()
+    with optimizer_lock():
+        keywords = optimizer.extract_keywords(job_description)
+        return keywords, optimizer.classify_job_type(keywords), optimizer.extract_weighted_keywords(job_description)
+
+
+@st.cache_data(max_entries=32)
+def resume_terms(job_type):
+    """Taxonomy terms present anywhere in the resume's sections for a job type"""
+    optimizer = load_optimizer()
+    with optimizer_lock():
+        sections = [optimizer.create_optimized_skills(job_type, []),
+                    optimizer.optimized_section('experience', job_type).source,
+                    optimizer.optimized_section('projects', job_type).source]
+    return set(load_matcher().extract(SECTION_SEPARATOR.join(sections)))
+
+
+@st.cache_data(max_entries=64)
+def build_latex(job_description, job_title):
+    """LaTeX of the resume; only built when the download is clicked"""
+    with optimizer_lock():
+        return load_optimizer().build_resume(job_description, job_title).latex
+
+
+def main():
+    st.set_page_config(page_title="ATS Resume Optimizer", page_icon="🎯", layout="wide")
+    st.title("🎯 ATS Resume Optimizer")
+
+    job_title = st.text_input("Job title (optional)").strip()
+    job_description = job_description_input("Job description",
+                                            "Paste or type the job description").strip()
+    if not job_description:
+        st.info("📋 Paste a job description to see its keywords and your coverage")
+        return
+
+    keywords, job_types, weighted = analyze(job_description)
+    job_type, confidence = job_types[0]
+    covered = resume_terms(job_type)
+    matched = [keyword for keyword in keywords if keyword in covered]
+    missing = [keyword for keyword in keywords if keyword not in covered]
+
+    columns = st.columns(3)
+    columns[0].metric("Job type", job_type.replace('_', ' ').title(), f"{confidence:.0%} confidence",
+                      delta_color="off")
+    columns[1].metric("Keywords found", len(keywords))
+    columns[2].metric("Keyword coverage", f"{len(matched) / len(keywords):.0%}" if keywords else "n/a")
+
+    left, right = st.columns(2)
+    with left:
+        st.subheader("✅ Covered by your resume")
+        st.write(", ".join(matched) or "None yet")
+        st.subheader("⚠️ Missing from your resume")
+        st.write(", ".join(missing) or "Nothing missing")
+    with right:
+        st.subheader("📊 Most distinctive keywords")
+        st.table([{'keyword': keyword, 'weight': round(weight, 2)} for keyword, weight in weighted[:10]])
+
+    # Editing only re-runs the analysis above; the document is built when the
+    # download is clicked, on a thread of its own
+    filename = load_optimizer().resume_filename(job_title, job_type)
+    st.download_button("⬇️ Download .tex", lambda: build_latex(job_description, job_title),
+                       file_name=filename, mime="application/x-tex")
+
+main()
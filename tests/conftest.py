@@ -0,0 +1,55 @@
+import os
+import sys
+
+import pytest
+
+# The optimizer is a set of top-level modules in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# A small resume used wherever the optimizer loads src/
+SECTIONS = {
+    'heading.tex': r"""\begin{center}
+    \textbf{\Huge \scshape Jane Doe} \\ \vspace{1pt}
+    \small 555-555-5555 $|$ \href{mailto:jane@example.com}{\underline{jane@example.com}}
+\end{center}""",
+    'education.tex': r"""\section{Education}
+  \resumeSubHeadingListStart
+    \resumeSubheading
+      {Indiana University}{Bloomington, IN}
+      {Master of Science in Data Science}{Aug 2022 -- May 2024}
+  \resumeSubHeadingListEnd""",
+    'skills.tex': r"""\section{Technical Skills}
+\begin{itemize}[leftmargin=0.15in, label={}]
+\small{\item{
+\textbf{Languages}{: Python, SQL, Java}
+}}
+\end{itemize}""",
+    'experience.tex': r"""\section{Experience}
+  \resumeSubHeadingListStart
+    \resumeSubheading
+      {Data Engineer}{Jan 2023 -- Present}
+      {Acme Corp}{Remote}
+      \resumeItemListStart
+        \resumeItem{Built scalable ETL pipelines in Spark and sql on aws}
+        \resumeItem{Designed reliable Kafka streaming for web applications}
+      \resumeItemListEnd
+  \resumeSubHeadingListEnd""",
+    'projects.tex': r"""\section{Projects}
+    \resumeSubHeadingListStart
+      \resumeProjectHeading
+          {\textbf{Dask Pipeline} $|$ \emph{Python, Dask, AWS}}{2023}
+          \resumeItemListStart
+            \resumeItem{Distributed data processing on aws with Dask}
+          \resumeItemListEnd
+    \resumeSubHeadingListEnd""",
+}
+
+
+@pytest.fixture
+def resume_src(tmp_path, monkeypatch):
+    """SECTIONS as src/ in the working directory (which worker processes inherit)"""
+    (tmp_path / 'src').mkdir()
+    for name, source in SECTIONS.items():
+        (tmp_path / 'src' / name).write_text(source, encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
@@ -0,0 +1,40 @@
+"""Resume generation from an event loop"""
+
+import asyncio
+
+from async_pipeline import generate_many, iter_generated
+
+POSTINGS = [(f"Data Engineer {i}", f"Data engineer {i} with Python, SQL, Spark and AWS")
+            for i in range(6)]
+
+
+def test_generate_many(resume_src):
+    results = asyncio.run(generate_many(POSTINGS, output_dir='out', max_in_flight=3))
+    assert sorted(result.title for result in results) == sorted(title for title, _ in POSTINGS)
+    assert all(result.ok for result in results)
+    assert all((resume_src / result.filename).is_file() for result in results)
+
+
+def test_early_exit_leaves_no_tasks_running(resume_src):
+    async def first_then_stop():
+        generated = iter_generated(POSTINGS, output_dir='out', max_in_flight=3)
+        async for result in generated:
+            break
+        await generated.aclose()
+        others = asyncio.all_tasks() - {asyncio.current_task()}
+        return result, others
+
+    result, others = asyncio.run(first_then_stop())
+    assert result.ok
+    assert others == set()
+
+
+def test_errors_are_reported_per_posting(resume_src):
+    async def postings():
+        yield "Good", "Data engineer with Python"
+        yield "Bad", None
+
+    results = asyncio.run(generate_many(postings(), output_dir='out'))
+    by_title = {result.title: result for result in results}
+    assert by_title['Good'].ok
+    assert not by_title['Bad'].ok
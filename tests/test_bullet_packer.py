@@ -0,0 +1,75 @@
+"""Grouped knapsack DP vs exhaustive search on small instances"""
+
+import random
+from itertools import product
+
+import pytest
+
+from bullet_packer import PackGroup, pack_bullets
+
+
+def selection_cost(groups, selection):
+    return sum((group.heading_cost if kept else 0) + sum(group.costs[i] for i in kept)
+               for group, kept in zip(groups, selection))
+
+
+def selection_value(groups, selection):
+    return sum(group.values[i] for group, kept in zip(groups, selection) for i in kept)
+
+
+def brute_force(groups, budget):
+    """Best total value over every subset of bullets, or None if nothing is feasible"""
+    best = None
+    bullets = [(g, i) for g, group in enumerate(groups) for i in range(len(group.costs))]
+    for mask in product((False, True), repeat=len(bullets)):
+        selection = [[] for _ in groups]
+        for (g, i), keep in zip(bullets, mask):
+            if keep:
+                selection[g].append(i)
+        if any(group.required and not kept for group, kept in zip(groups, selection)):
+            continue
+        if selection_cost(groups, selection) > budget:
+            continue
+        value = selection_value(groups, selection)
+        if best is None or value > best:
+            best = value
+    return best
+
+
+def random_groups(rng):
+    groups = []
+    for _ in range(rng.randint(1, 4)):
+        count = rng.randint(1, 4)
+        groups.append(PackGroup(rng.randint(0, 2),
+                                [rng.randint(1, 3) for _ in range(count)],
+                                [round(rng.uniform(0, 5), 2) for _ in range(count)],
+                                required=rng.random() < 0.3))
+    return groups
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    groups = random_groups(rng)
+    budget = rng.randint(0, 14)
+    expected = brute_force(groups, budget)
+    selection = pack_bullets(groups, budget)
+
+    if expected is None:
+        assert selection is None
+        return
+    assert selection is not None
+    assert selection_cost(groups, selection) <= budget
+    assert all(kept for group, kept in zip(groups, selection) if group.required)
+    assert selection_value(groups, selection) == pytest.approx(expected)
+
+
+def test_heading_is_paid_once():
+    group = PackGroup(2, [1, 1, 1], [1.0, 1.0, 1.0])
+    assert [len(kept) for kept in pack_bullets([group], 4)] == [2]
+    assert pack_bullets([group], 2) == [[]]
+
+
+def test_required_groups_that_do_not_fit():
+    assert pack_bullets([PackGroup(2, [3], [1.0], required=True)], 4) is None
+    assert pack_bullets([], 10) == []
@@ -0,0 +1,41 @@
+"""Aho-Corasick keyword matching"""
+
+from keyword_engine import KeywordMatcher, build_keyword_matrix
+
+VOCABULARY = {
+    'frameworks': {'react': ['react.js', 'reactjs'], 'spark': ['apache spark', 'pyspark']},
+    'data': {'etl/elt': ['etl', 'elt', 'etl pipelines']},
+    'languages': ['c++', 'go', 'java', 'javascript'],
+}
+
+
+def matched(matcher, text):
+    return [(text[start:end], matcher.terms[term_id]) for start, end, term_id in matcher.finditer(text)]
+
+
+def test_nested_aliases_count_once():
+    matcher = KeywordMatcher(VOCABULARY)
+    text = "React.js and Apache Spark for ETL/ELT"
+    assert matched(matcher, text) == [('React.js', 'react'), ('Apache Spark', 'spark'), ('ETL/ELT', 'etl/elt')]
+    assert build_keyword_matrix(matcher, [text]).row(0) == {'react': 1, 'spark': 1, 'etl/elt': 1}
+
+
+def test_separate_mentions_all_count():
+    matcher = KeywordMatcher(VOCABULARY)
+    text = "react, reactjs and React; ETL pipelines, then ELT"
+    assert matched(matcher, text) == [('react', 'react'), ('reactjs', 'react'), ('React', 'react'),
+                                      ('ETL pipelines', 'etl/elt'), ('ELT', 'etl/elt')]
+    assert build_keyword_matrix(matcher, [text]).row(0) == {'react': 3, 'etl/elt': 2}
+
+
+def test_different_terms_may_overlap():
+    matcher = KeywordMatcher(VOCABULARY)
+    # java matches before a hyphen but not as the start of javascript
+    assert matcher.extract("JavaScript and Java-based tools") == ['java', 'javascript']
+
+
+def test_word_boundaries():
+    matcher = KeywordMatcher(VOCABULARY)
+    assert matcher.extract("going to mongodb, reactive sparkles, google") == []
+    assert matcher.extract("Go, C++ and pyspark_jobs") == ['c++', 'go']
+    assert matcher.extract("(react)") == ['react']
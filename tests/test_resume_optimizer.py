@@ -0,0 +1,31 @@
+"""Sections that end up in the generated document"""
+
+from resume_optimizer import ResumeOptimizer
+
+DESCRIPTION = "Data engineer with Python, SQL, Spark, Kafka and AWS experience"
+
+
+def list_balance(latex):
+    return latex.count(r'\resumeSubHeadingListStart') - latex.count(r'\resumeSubHeadingListEnd')
+
+
+def test_projects_are_kept_when_they_fit(resume_src):
+    latex = ResumeOptimizer().build_resume(DESCRIPTION, "Data Engineer").latex
+    assert r'\section{Projects}' in latex
+    assert 'Dask Pipeline' in latex
+    assert list_balance(latex) == 0
+
+
+def test_empty_projects_section_is_left_out(resume_src):
+    # Experience alone fills the budget, so no project is packed
+    optimizer = ResumeOptimizer(line_budget=3, project_count=1)
+    latex = optimizer.build_resume(DESCRIPTION, "Data Engineer").latex
+    assert r'\section{Projects}' not in latex
+    assert 'PROJECTS' not in latex
+    assert list_balance(latex) == 0
+    assert latex.endswith("\\resumeSubHeadingListEnd\n\n\\end{document}")
+
+
+def test_no_selected_projects_render_nothing(resume_src):
+    optimizer = ResumeOptimizer()
+    assert optimizer.optimize_projects_for_job_type('general', [], selection={}) == ''
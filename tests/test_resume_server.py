@@ -0,0 +1,102 @@
+"""The resume HTTP service, exercised over localhost"""
+
+import json
+import time
+import asyncio
+
+import pytest
+
+from resume_server import ResumeServer
+
+DESCRIPTION = "Data engineer with Python, SQL, Spark, Kafka and AWS experience"
+
+
+async def request(port, method, path, body=b'', headers=None):
+    """(status, headers, body) of one request on its own connection"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    lines = [f"{method} {path} HTTP/1.1", "Host: localhost", f"Content-Length: {len(body)}",
+             "Connection: close"] + [f"{name}: {value}" for name, value in (headers or {}).items()]
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, content = response.partition(b'\r\n\r\n')
+    status_line, *header_lines = head.decode('latin-1').split('\r\n')
+    response_headers = dict(line.split(': ', 1) for line in header_lines)
+    return int(status_line.split()[1]), response_headers, content
+
+
+def serve(workers, client):
+    """Run client(server, port) against a server on an ephemeral localhost port"""
+    server = ResumeServer(workers)
+
+    async def main():
+        listener = await server.listen('127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            return await client(server, port)
+
+    try:
+        return asyncio.run(main())
+    finally:
+        server.close()
+
+
+def resume_request(description=DESCRIPTION, title='Data Engineer'):
+    return json.dumps({'description': description, 'title': title}).encode('utf-8')
+
+
+def test_identical_requests_are_computed_once(resume_src):
+    async def client(server, port):
+        # Keep the only worker busy so every request arrives while the first is pending
+        server.executor.submit(time.sleep, 0.5)
+        responses = await asyncio.gather(*[request(port, 'POST', '/resume', resume_request())
+                                           for _ in range(8)])
+        return responses, dict(server.stats)
+
+    responses, stats = serve(1, client)
+    assert [status for status, _, _ in responses] == [200] * 8
+    bodies = [json.loads(body) for _, _, body in responses]
+    assert all(body == bodies[0] for body in bodies)
+    assert bodies[0]['filename'] == 'Data_Engineer_Resume.tex'
+    assert '\\begin{document}' in bodies[0]['latex']
+    assert stats == {'requests': 8, 'computed': 1, 'coalesced': 7}
+
+
+def test_latex_response(resume_src):
+    async def client(server, port):
+        return await request(port, 'POST', '/resume', resume_request(),
+                             {'Accept': 'application/x-tex'})
+
+    status, headers, body = serve(1, client)
+    assert status == 200
+    assert headers['Content-Type'].startswith('application/x-tex')
+    assert body.decode('utf-8').rstrip().endswith('\\end{document}')
+
+
+@pytest.mark.parametrize('method, path, body, status', [
+    ('POST', '/resume', b'not json', 400),
+    ('POST', '/resume', b'["a list"]', 400),
+    ('POST', '/resume', json.dumps({'title': 'No description'}).encode(), 400),
+    ('POST', '/resume', json.dumps({'description': 'Python', 'title': 3}).encode(), 400),
+    ('GET', '/missing', b'', 404),
+    ('GET', '/resume', b'', 405),
+    ('POST', '/health', b'', 405),
+])
+def test_errors(resume_src, method, path, body, status):
+    async def client(server, port):
+        return await request(port, method, path, body)
+
+    response_status, _, content = serve(1, client)
+    assert response_status == status
+    assert 'error' in json.loads(content)
+
+
+def test_health(resume_src):
+    async def client(server, port):
+        return await request(port, 'GET', '/health')
+
+    status, _, body = serve(2, client)
+    assert status == 200
+    assert json.loads(body) == {'requests': 0, 'computed': 0, 'coalesced': 0,
+                                'status': 'ok', 'workers': 2}
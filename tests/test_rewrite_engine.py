@@ -0,0 +1,70 @@
+"""Fused rewrite engine vs the sequential re.sub passes it replaces"""
+
+import pytest
+
+from latex_scanner import rewrite_text
+from rewrite_engine import RewriteEngine, rewrite_rules, rewrite_sequential
+
+JOB_TYPES = ['network_engineer', 'data_engineering', 'data_analyst', 'software_engineer', 'general']
+
+SECTION = r"""\resumeSubHeadingListStart
+  \resumeSubheading
+    {Data Engineer}{Jan 2022 -- Present}
+    {Acme Analytics}{Remote}
+    \resumeItemListStart
+      \resumeItem{Migrated the Analytics Platform to AWS and replaced ad hoc Python Scripts with scalable, reliable jobs}
+      \resumeItem{Built SQL dashboards and sql-backed Web Applications for a cross functional team}
+      \resumeItem{Led API development in an agile team, solving product challenges with strong communication skills}
+      \resumeItem{Kept resilient services (awsome, sqlite, unreliable) at 99.9\% uptime} % aws sql comment
+    \resumeItemListEnd
+  \resumeProjectHeading
+    {\textbf{Web Application Monitor} $|$ \emph{AWS, SQL} $|$ \href{https://github.com/me/aws-sql-dashboards}{\underline{aws dashboards}}}{2023}
+\resumeSubHeadingListEnd"""
+
+
+@pytest.mark.parametrize('job_type', JOB_TYPES)
+def test_fused_matches_sequential(job_type):
+    rules = rewrite_rules(job_type)
+    engine = RewriteEngine(rules)
+    assert engine.pattern is not None
+    assert engine.rewrite(SECTION) == rewrite_sequential(SECTION, rules)
+
+
+@pytest.mark.parametrize('rules', [
+    # A capturing group would shift match.lastindex
+    [(r'\b(web) apps?\b', 'web applications'), (r'\baws\b', 'AWS')],
+    # re.sub expands the backslash, a plain lookup would not
+    [(r'\bsql\b', r'SQL\\ and more'), (r'\baws\b', 'AWS')],
+    # The first replacement is rewritten again by a later rule
+    [(r'\bdashboards\b', 'AWS dashboards'), (r'\baws\b', 'AWS cloud services')],
+    # Overlapping patterns: one pass rewrites platform before the later rule sees it
+    [(r'\bplatform\b', 'system'), (r'\banalytics platform\b', 'data engineering platform')],
+    [(r'\bweb applications?\b', 'frontend applications'), (r'\bapplication\b', 'service')],
+])
+def test_unfusable_rules_fall_back_to_sequential(rules):
+    engine = RewriteEngine(rules)
+    assert engine.pattern is None
+    assert engine.rewrite(SECTION) == rewrite_sequential(SECTION, rules)
+
+
+def test_plain_alternation_matches_sequential():
+    # Without \b on every pattern the shared boundary cannot be hoisted
+    rules = [(r'sql', 'SQL'), (r'\baws\b', 'AWS'), (r'\bagile\b', 'Agile methodology')]
+    engine = RewriteEngine(rules)
+    assert engine.pattern is not None
+    assert engine.rewrite(SECTION) == rewrite_sequential(SECTION, rules)
+
+
+def test_prose_only_rewrite_skips_comments_and_urls():
+    rewrite = RewriteEngine(rewrite_rules('data_analyst')).rewrite
+    rewritten = rewrite_text(SECTION, rewrite)
+
+    # Prose, including link text, is rewritten as before
+    assert 'Advanced SQL business intelligence dashboards' in rewritten
+    assert r'\underline{AWS cloud services business intelligence dashboards}' in rewritten
+    # Comments and URLs are not, unlike the whole-section rewrite
+    assert '% aws sql comment' in rewritten
+    assert r'\href{https://github.com/me/aws-sql-dashboards}' in rewritten
+    whole_section = rewrite(SECTION)
+    assert '% aws sql comment' not in whole_section
+    assert 'aws-sql-dashboards' not in whole_section
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Watch Mode for Resume Optimizer
+Regenerates the resume whenever src/, preamble.tex or the job description
+file is saved, recomputing only the stages that depend on what changed
+"""
+
+import os
+import time
+import logging
+
+POLL_INTERVAL = 0.05
+# A burst of saves (e.g. an editor's write-then-rename) settles within this
+DEBOUNCE = 0.1
+
+
+def file_signature(path):
+    """(mtime, size) of a file, or None while it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class FileWatcher:
+    """Polls the modification times of a fixed set of files"""
+
+    def __init__(self, paths, interval=POLL_INTERVAL, debounce=DEBOUNCE):
+        self.paths = list(paths)
+        self.interval = interval
+        self.debounce = debounce
+        self.signatures = {path: file_signature(path) for path in self.paths}
+
+    def poll(self):
+        """Paths whose signature changed since the last poll"""
+        changed = set()
+        for path in self.paths:
+            signature = file_signature(path)
+            if signature != self.signatures[path]:
+                self.signatures[path] = signature
+                changed.add(path)
+        return changed
+
+    def wait(self):
+        """Block until files change, then return them once no save has followed for debounce seconds"""
+        changed = set()
+        quiet_since = None
+        while True:
+            now = time.monotonic()
+            new = self.poll()
+            if new:
+                changed |= new
+                quiet_since = now
+            elif changed and now - quiet_since >= self.debounce:
+                return changed
+            time.sleep(self.interval)
+
+
+def watch(optimizer, job_path, load_job, output_dir=None, compile_pool=None,
+          interval=POLL_INTERVAL, debounce=DEBOUNCE):
+    """Generate the resume, then regenerate it on every change until interrupted
+
+    load_job() returns (job_description, job_title) read from job_path."""
+    job_path = os.path.abspath(job_path)
+    sections = optimizer.watched_paths()
+    watcher = FileWatcher(list(sections) + [job_path], interval, debounce)
+    job_description, job_title = load_job()
+    if not job_description:
+        print(f"❌ No job description in {job_path}")
+        return 1
+
+    optimizer.build_resume(job_description, job_title, compile_pool, output_dir, save=True)
+    print(f"\n👀 Watching src/, preamble.tex and {os.path.basename(job_path)} (Ctrl+C to stop)")
+    # One line per regeneration from here on; warnings still show
+    logger = logging.getLogger('resume_optimizer')
+    level = logger.level
+    logger.setLevel(max(level, logging.WARNING))
+    try:
+        while True:
+            changed = watcher.wait()
+            start = time.perf_counter()
+            names = optimizer.reload_sections(changed)
+            if job_path in changed:
+                description, title = load_job()
+                if description:
+                    names.append('job description')
+                    job_description, job_title = description, title
+            if not names:
+                continue
+            result = optimizer.build_resume(job_description, job_title, compile_pool, output_dir,
+                                            save=True)
+            elapsed = (time.perf_counter() - start) * 1000
+            stages = ', '.join(name for name in result.timings if name != 'write') or 'none'
+            print(f"🔁 {', '.join(names)} changed: rewrote {result.filename} in {elapsed:.0f}ms "
+                  f"(recomputed: {stages})")
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        logger.setLevel(level)
+    return 0